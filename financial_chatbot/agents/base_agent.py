@@ -1,9 +1,14 @@
 from utils.gemini_client import GeminiClient
+from utils.map_reduce import get_llm_mapper
+from core.embedding_cache import text_hash
+from config.settings import GEMINI_MODEL
 from abc import ABC, abstractmethod
+from typing import List
 
 class BaseAgent(ABC):
     def __init__(self):
         self.gemini = GeminiClient()
+        self.mapper = get_llm_mapper()
         
     @abstractmethod
     def analyze(self, query: str, company_data: dict, filing_data: str) -> str:
@@ -13,6 +18,28 @@ class BaseAgent(ABC):
     def _create_prompt(self, template: str, **kwargs) -> str:
         
         return template.format(**kwargs)
+
+    def _summarize_chunks(self, chunks: List[dict], instruction: str, namespace: str = None, vector_store=None) -> List[str]:
+        # Map step: one Gemini summary per non-empty chunk, run concurrently; order follows the chunks
+        # and chunks whose call failed are left out. With a vector store, summaries are cached per chunk
+        # and prompt (the prompt version is a hash of the instruction), so repeat questions skip this step.
+        chunks = [chunk for chunk in chunks if chunk["text"].strip()]
+        prompt_version = text_hash(instruction)[:16]
+        use_cache = namespace is not None and hasattr(vector_store, "get_summaries")
+
+        summaries = vector_store.get_summaries(namespace, chunks, prompt_version, GEMINI_MODEL) if use_cache else [None] * len(chunks)
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        if missing:
+            result = self.mapper.map(
+                lambda i: self.gemini.generate_response(f"{instruction}:\n\n{chunks[i]['text']}"), missing
+            )
+            done = [(i, summary) for i, summary in zip(missing, result.results) if summary is not None]
+            for i, summary in done:
+                summaries[i] = summary
+            if use_cache and done:
+                vector_store.save_summaries(namespace, [chunks[i] for i, _ in done], [s for _, s in done],
+                                            prompt_version, GEMINI_MODEL)
+        return [summary for summary in summaries if summary is not None]
     
     @abstractmethod
     def retrieve_and_analyze(self, query: str, company_data: dict, namespace: str, vector_store):
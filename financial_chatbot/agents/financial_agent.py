@@ -14,11 +14,8 @@ class FinancialAgent(BaseAgent):
             return f"No relevant sections ({sections}) found for {company_data.get('company_name')}."
         
         # Summarize each chunk
-        summaries = []
         print('summary by chunk')
-        for chunk in all_chunks:
-            prompt = f"Summarize the following financial discussion:\n\n{chunk['text']}"
-            summaries.append(self.gemini.generate_response(prompt))
+        summaries = self._summarize_chunks(all_chunks, "Summarize the following financial discussion", namespace, vector_store)
 
         if not summaries:
             return f"No usable text found in sections {sections} for {company_data.get('company_name')}"
@@ -1,20 +1,20 @@
 from agents.base_agent import BaseAgent
 from config.settings import INTENT_SECTIONS
-import re
-import spacy
-from typing import List
-from utils.relationship_extractor_gemini import extract_relationships_gemini
+from typing import Dict, List
+import threading
+from utils.relationship_extractor_gemini import extract_relationships_gemini, ExtractionStats
+from utils import ner
 import feedparser
 from utils.save_to_neo4j import save_to_neo4j
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    import subprocess
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"], check=True)
-    nlp = spacy.load("en_core_web_sm")
+CANDIDATE_LOCK_STRIPES = 32
 
 class RelationshipAgent(BaseAgent):
+    # Striped locks serialize candidate extraction per namespace, so an ingestion-time run and a request
+    # never parse the same section twice, while already-extracted reads never wait. A fixed set of
+    # stripes keeps memory bounded however many namespaces are ingested.
+    _candidates_locks = [threading.Lock() for _ in range(CANDIDATE_LOCK_STRIPES)]
+
     def fetch_google_news_sentences(self, company_name: str,user_query: str, max_results: int = 10) -> List[str]:
 
         #Fetch latest Google News headlines & summaries for the company,
@@ -54,35 +54,12 @@ class RelationshipAgent(BaseAgent):
 
         sections = INTENT_SECTIONS.get("relationship_graph", [])
 
-        # ----IF USE ALL CHUNKS-----
-        all_chunks = []
-        for sec in sections:
-            section_chunks = vector_store.get_chunks_by_section(namespace, sec)
-            all_chunks.extend(section_chunks)
-
-        if not all_chunks:
+        # Candidate sentences with ≥2 ORG entities, precomputed per section at ingestion
+        section_candidates = self.ensure_candidates(namespace, vector_store, sections)
+        if not section_candidates:
             return f"No relevant sections {sections} found for {company_data.get('company_name')}."
 
-        print(f"Retrieved {len(all_chunks)} chunks for relationship analysis.")
-
-        # ------TOP N CHUNCKS-----------
-        # relevant_chunks = vector_store.search(
-        #     namespace=namespace,
-        #     query=query,
-        #     top_k=12, 
-        #     filter_sections=sections
-        # )
-
-        # if not relevant_chunks:
-        #     return f"No relevant sections {sections} found for {company_data.get('company_name')}."
-
-        # print(f"Retrieved {len(relevant_chunks)} chunks for relationship analysis.")
-        #------------------------------
-
-        # Extract candidate sentences with ≥2 named entities
-        candidate_sentences = []
-        for chunk in all_chunks:
-            candidate_sentences.extend(self.extract_candidate_sentences(chunk["text"]))
+        candidate_sentences = [c["text"] for sec in sections for c in section_candidates.get(sec, [])]
 
         print(f"Extracted {len(candidate_sentences)} candidate sentences with multiple named entities.")
 
@@ -102,25 +79,48 @@ class RelationshipAgent(BaseAgent):
             return f"No company-related relationship sentences found for {company_data.get('company_name')}."
 
         # Use Gemini function calling
-        relationships = extract_relationships_gemini(query,combined_sentences, company_data["company_name"])
+        extraction_stats = ExtractionStats()
+        relationships = extract_relationships_gemini(query,combined_sentences, company_data["company_name"], stats=extraction_stats)
+        print(f"Relationship extraction: {extraction_stats.batches} batches, {extraction_stats.failed_batches} failed, "
+              f"latency ms {extraction_stats.batch_latency_ms}")
 
         return self.analyze(query, company_data, relationships)
     
+    def ensure_candidates(self, namespace: str, vector_store, sections: List[str]) -> Dict[str, List[Dict]]:
+        # Stored sections' candidates from the namespace artifact; sections without one (ingested before
+        # the artifact existed, or while extraction was off) are parsed once in a batched spaCy pass and saved
+        not_stored = vector_store.missing_sections(namespace, sections)
+        stored = [sec for sec in sections if sec not in not_stored]
+        candidates = vector_store.get_candidates(namespace)
+        if any(str(sec) not in candidates for sec in stored):
+            with self._candidates_lock(namespace):
+                # Another thread may have extracted them while this one waited
+                candidates = vector_store.get_candidates(namespace)
+                missing = [sec for sec in stored if str(sec) not in candidates]
+                if missing:
+                    computed = {}
+                    for sec in missing:
+                        section_chunks = vector_store.get_chunks_by_section(namespace, sec)
+                        computed[str(sec)] = [
+                            candidate
+                            for chunk_candidates in ner.extract_candidates(chunk["text"] for chunk in section_chunks)
+                            for candidate in chunk_candidates
+                        ]
+                        print(f"Extracted {len(computed[str(sec)])} candidate sentences from {len(section_chunks)} chunks of section {sec}.")
+                    vector_store.save_candidates(namespace, computed)
+                    candidates = vector_store.get_candidates(namespace)
+        return {sec: candidates[str(sec)] for sec in stored if str(sec) in candidates}
+
+    def _candidates_lock(self, namespace: str) -> threading.Lock:
+        return self._candidates_locks[hash(namespace) % len(self._candidates_locks)]
+
     def extract_candidate_sentences(self, text: str):
-        text = self.clean_text(text)
-        doc = nlp(text[:1_000_000]) 
-        candidate_sentences = []
-        for sent in doc.sents:
-            ents = [ent for ent in sent.ents if ent.label_ in ["ORG"]]
-            if len(ents) >= 2:
-                candidate_sentences.append(sent.text.strip())
+        candidate_sentences = ner.extract_candidate_sentences([text])[0]
         print (f"Important Sentences:{candidate_sentences}")
         return candidate_sentences
 
     def clean_text(self, text: str):
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)]', ' ', text)
-        return text.strip()
+        return ner.clean_text(text)
 
 
     
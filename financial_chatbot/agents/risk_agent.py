@@ -12,11 +12,7 @@ class RiskAgent(BaseAgent):
 
         # Summarize each chunk 
         print('summary by chunks')
-        summaries = []
-        for chunk in all_chunks:
-            if chunk["text"].strip():
-                prompt = f"Summarize the following risk factors:\n\n{chunk['text']}"
-                summaries.append(self.gemini.generate_response(prompt))
+        summaries = self._summarize_chunks(all_chunks, "Summarize the following risk factors", namespace, vector_store)
 
         if not summaries:
             return f"No usable text found in sections {sections} for {company_data.get('company_name')}"
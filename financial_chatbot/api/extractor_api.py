@@ -1,15 +1,21 @@
-import requests
 import logging
 import re
-from config.settings import SEC_BASE_URL, SEC_API_KEY
+from config.settings import SEC_BASE_URL
+from api.http_client import get_sec_client
+from api.response_cache import get_response_cache, filing_key
+
+# Bodies the extractor returns while a filing is still being processed (or on a failed extraction)
+TRANSIENT_EXTRACT_RE = re.compile(r"^\s*(processing|undefined|null|error)?\s*$", re.IGNORECASE)
+
+
+def is_complete_extract(text) -> bool:
+    return isinstance(text, str) and not TRANSIENT_EXTRACT_RE.match(text)
 
 class ExtractorApi:
     def __init__(self):
         self.base_url = f"{SEC_BASE_URL.rstrip('/')}/extractor"
-        self.headers = {
-            "Authorization": SEC_API_KEY,
-            "User-Agent": "Financial Analyzer 1.0"
-        }
+        self.client = get_sec_client()
+        self.cache = get_response_cache()
 
     def extract_section(self, filing_url: str, item: str, return_type: str = "text") -> str | None:
         try:
@@ -19,10 +25,16 @@ class ExtractorApi:
                 "type": return_type
             }
             logging.info(f"Extracting item {item} from filing: {filing_url}")
-            response = requests.get(self.base_url, params=params, headers=self.headers)
-            response.raise_for_status()
-
-            raw_text = response.text
+            # Raw text is cached forever by accession + item, so sections can be re-chunked without re-downloading.
+            # Empty and placeholder bodies are not cached, so the section is fetched again next time.
+            raw_text = self.cache.fetch(
+                "extract", [filing_key(filing_url), item, return_type],
+                lambda: self.client.get(self.base_url, params=params).text,
+                cacheable=is_complete_extract
+            )
+            if not is_complete_extract(raw_text):
+                logging.warning(f"Extractor returned no content for item {item} of {filing_url}")
+                return None
 
         
             clean_text = re.sub(r"[^\x20-\x7E\n\r\t]", "", raw_text)
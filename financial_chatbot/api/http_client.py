@@ -0,0 +1,148 @@
+import asyncio
+import importlib.util
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import (
+    SEC_API_KEY, SEC_API_POOL_SIZE, SEC_API_CONNECT_TIMEOUT, SEC_API_READ_TIMEOUT,
+    SEC_API_REQUESTS_PER_SECOND, SEC_API_BURST, MAX_REQUESTS_PER_HOST
+)
+from utils.helpers import retry_with_backoff, aretry_with_backoff, HostLimiter, TokenBucket
+
+# httpx (with h2 installed) gives HTTP/2 multiplexing; otherwise requests' HTTP/1.1 keep-alive pool is used
+HTTPX_AVAILABLE = importlib.util.find_spec("httpx") is not None
+HTTP2_AVAILABLE = HTTPX_AVAILABLE and importlib.util.find_spec("h2") is not None
+
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+
+def is_retryable(error: Exception) -> bool:
+    # Network errors, rate limiting and server errors are worth retrying; other 4xx are not
+    response = getattr(error, "response", None)
+    if response is not None:
+        return response.status_code in RETRYABLE_STATUS
+    if isinstance(error, requests.RequestException):
+        return True
+    if HTTPX_AVAILABLE:
+        import httpx
+        return isinstance(error, httpx.TransportError)
+    return False
+
+
+class SecApiClient:
+    """Shared client for api.sec-api.io: pooled keep-alive connections, timeouts, a request quota and retries.
+
+    Sync callers use get/post, async callers aget/apost. Both share the same rate limiter, per-host
+    cap and retry policy. Call close()/aclose() when the client is no longer needed.
+    """
+
+    def __init__(self, api_key: str = SEC_API_KEY):
+        self.headers = {
+            "Authorization": api_key,
+            "User-Agent": "Financial Analyzer 1.0"
+        }
+        self.rate_limiter = TokenBucket(SEC_API_REQUESTS_PER_SECOND, SEC_API_BURST)
+        self.host_limiter = HostLimiter(MAX_REQUESTS_PER_HOST)
+
+        if HTTPX_AVAILABLE:
+            import httpx
+            self._timeout = httpx.Timeout(SEC_API_READ_TIMEOUT, connect=SEC_API_CONNECT_TIMEOUT)
+            self._limits = httpx.Limits(max_connections=SEC_API_POOL_SIZE, max_keepalive_connections=SEC_API_POOL_SIZE)
+            self.session = httpx.Client(http2=HTTP2_AVAILABLE, headers=self.headers, timeout=self._timeout, limits=self._limits)
+        else:
+            self._timeout = (SEC_API_CONNECT_TIMEOUT, SEC_API_READ_TIMEOUT)
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=SEC_API_POOL_SIZE, pool_maxsize=SEC_API_POOL_SIZE)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+        # httpx.AsyncClient is bound to the event loop it first ran on: one client, replaced if the loop changes
+        self._async = None
+        self._async_loop = None
+        self._async_lock = threading.Lock()
+
+    # ---------- sync ----------
+
+    def get(self, url: str, params: dict = None, headers: dict = None):
+        return self.request("GET", url, params=params, headers=headers)
+
+    def post(self, url: str, json: dict = None, headers: dict = None):
+        return self.request("POST", url, json=json, headers=headers)
+
+    def request(self, method: str, url: str, **kwargs):
+        return retry_with_backoff(lambda: self._send(method, url, **kwargs), should_retry=is_retryable)
+
+    def _send(self, method: str, url: str, **kwargs):
+        self.rate_limiter.acquire()
+        with self.host_limiter.limit(url):
+            response = self.session.request(method, url, timeout=self._timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    # ---------- async ----------
+
+    async def aget(self, url: str, params: dict = None, headers: dict = None):
+        return await self.arequest("GET", url, params=params, headers=headers)
+
+    async def apost(self, url: str, json: dict = None, headers: dict = None):
+        return await self.arequest("POST", url, json=json, headers=headers)
+
+    async def arequest(self, method: str, url: str, **kwargs):
+        if not HTTPX_AVAILABLE:
+            # No async HTTP library: run the pooled sync client off the event loop
+            return await asyncio.to_thread(self.request, method, url, **kwargs)
+        return await aretry_with_backoff(lambda: self._asend(method, url, **kwargs), should_retry=is_retryable)
+
+    async def _asend(self, method: str, url: str, **kwargs):
+        await self.rate_limiter.acquire_async()
+        async with self.host_limiter.alimit(url):
+            response = await self._async_client().request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _async_client(self):
+        import httpx
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            if self._async is not None and self._async_loop is not loop:
+                self._discard_async_client()
+            if self._async is None:
+                self._async = httpx.AsyncClient(http2=HTTP2_AVAILABLE, headers=self.headers,
+                                                timeout=self._timeout, limits=self._limits)
+                self._async_loop = loop
+            return self._async
+
+    def _discard_async_client(self):
+        # Close the previous loop's client on that loop if it still runs; a closed loop already dropped its sockets
+        client, loop = self._async, self._async_loop
+        self._async = self._async_loop = None
+        if not loop.is_closed() and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    # ---------- lifecycle ----------
+
+    async def aclose(self):
+        with self._async_lock:
+            client, self._async, self._async_loop = self._async, None, None
+        if client is not None:
+            await client.aclose()
+
+    def close(self):
+        with self._async_lock:
+            if self._async is not None:
+                self._discard_async_client()
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_sec_client() -> SecApiClient:
+    # One pooled client per process, shared by MappingApi, QueryApi and ExtractorApi
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SecApiClient()
+        return _client
@@ -1,19 +1,15 @@
-import requests
 import logging
-from config.settings import SEC_BASE_URL, SEC_API_KEY
-import os
-import json
+from config.settings import SEC_BASE_URL, SEC_MAPPING_CACHE_TTL
+from api.http_client import get_sec_client
+from api.response_cache import get_response_cache
+from utils.ticker_index import get_ticker_index
 from urllib.parse import quote
 class MappingApi:
     def __init__(self):
         self.base_url = SEC_BASE_URL
-        self.headers = {
-            'Authorization': SEC_API_KEY,
-            'User-Agent': 'Financial Analyzer 1.0'
-        }
-        json_path = os.path.join(os.path.dirname(__file__), "../data/company_tickers.json")
-        with open(json_path, "r") as f:
-            self.ticker_data = json.load(f)
+        self.client = get_sec_client()
+        self.cache = get_response_cache()
+        self.ticker_index = get_ticker_index()
         
     def resolve(self, entity_info: dict) -> dict:
         #Resolve company info to CIK
@@ -49,17 +45,15 @@ class MappingApi:
     #         return None
 
     def _resolve_by_ticker(self, ticker: str) -> dict | None:
-        #Resolve ticker to CIK using SEC's official JSON
-        ticker_upper = ticker.upper()
-
-        for entry in self.ticker_data.values():
-            if entry.get("ticker") == ticker_upper:
-                return {
-                    "ticker": ticker_upper,
-                    "cik": str(entry.get("cik_str")).lstrip("0"),
-                    "company_name": entry.get("title")
-                }
-        return None
+        #Resolve ticker to CIK using SEC's official JSON (hash lookup in the shared ticker index)
+        entry = self.ticker_index.lookup_ticker(ticker)
+        if not entry:
+            return None
+        return {
+            "ticker": entry["ticker"],
+            "cik": entry["cik"],
+            "company_name": entry["title"]
+        }
             
     from urllib.parse import quote
 
@@ -70,10 +64,11 @@ class MappingApi:
             encoded_name = quote(company_name)
             url = f"{self.base_url}/mapping/name/{encoded_name}"
 
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self.cache.fetch(
+                "mapping_name", [company_name.strip().lower()],
+                lambda: self.client.get(url).json(),
+                ttl=SEC_MAPPING_CACHE_TTL
+            )
 
             # The API returns an array of matches — use the first one
             if isinstance(data, list) and data:
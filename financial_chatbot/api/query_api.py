@@ -1,17 +1,16 @@
-import requests
 import logging
-from config.settings import SEC_BASE_URL, SEC_API_KEY
+from config.settings import SEC_BASE_URL, SEC_FILINGS_CACHE_TTL
+from api.http_client import get_sec_client
+from api.response_cache import get_response_cache
 
 class QueryApi:
     def __init__(self):
         self.base_url = SEC_BASE_URL.rstrip("/")
-        self.headers = {
-            "Authorization": SEC_API_KEY,
-            "User-Agent": "Financial Analyzer 1.0",
-            "Content-Type": "application/json"
-        }
+        self.client = get_sec_client()
+        self.cache = get_response_cache()
         
-    def get_filings(self, params: dict) -> dict:
+    def get_filings(self, params: dict, revalidate: bool = False) -> dict:
+        # revalidate bypasses the cached search (used by the filing catalog's refresh)
         try:
             cik = params.get("cik")
             ticker = params.get("ticker")
@@ -35,9 +34,12 @@ class QueryApi:
             }
 
             url = f"{self.base_url}"
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+            data = self.cache.fetch(
+                "filings", [search_query, payload["size"]],
+                lambda: self.client.post(url, json=payload).json(),
+                ttl=SEC_FILINGS_CACHE_TTL,
+                revalidate=revalidate
+            )
 
             filings_list = data.get("filings", [])
             if not filings_list:
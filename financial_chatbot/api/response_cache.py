@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from config.settings import SEC_CACHE_DIR, SEC_OFFLINE
+
+# Accession number path component of an EDGAR URL, e.g. .../data/320193/000032019323000106/aapl-20230930.htm
+ACCESSION_RE = re.compile(r"/(\d{10}-?\d{2}-?\d{6})/")
+
+
+class OfflineCacheMiss(LookupError):
+    """Raised in offline mode when a response is not in the cache."""
+
+
+def filing_key(filing_url: str) -> str:
+    # Key extracts by accession number when the URL has one, so different links to the same filing share entries
+    match = ACCESSION_RE.search(filing_url)
+    return match.group(1).replace("-", "") if match else filing_url
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of SEC-API responses.
+
+    Entries are JSON files at {cache_dir}/{kind}/{key[:2]}/{key}.json, where key is the sha256
+    of the request identity (kind + parts). Writes are atomic, so concurrent workers are safe.
+    """
+
+    def __init__(self, cache_dir: str = SEC_CACHE_DIR, offline: bool = SEC_OFFLINE):
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, kind: str, parts: list) -> str:
+        return hashlib.sha256(json.dumps([kind, *parts]).encode("utf-8")).hexdigest()
+
+    def get(self, kind: str, parts: list, ttl: float = None):
+        # Cached value, or None if missing or older than ttl (expired entries still count in offline mode)
+        path = self._path(kind, self.key(kind, parts))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if ttl is not None and not self.offline and time.time() - entry["stored_at"] > ttl:
+            return None
+        return entry["value"]
+
+    def put(self, kind: str, parts: list, value):
+        path = self._path(kind, self.key(kind, parts))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"kind": kind, "parts": parts, "stored_at": time.time(), "value": value}, f)
+        os.replace(tmp_path, path)
+
+    def fetch(self, kind: str, parts: list, fetch_fn, ttl: float = None, cacheable=None, revalidate: bool = False):
+        # Serve from cache, otherwise call fetch_fn() and store its (JSON-serializable) result.
+        # Values failing cacheable(value) (empty or placeholder bodies) are returned but never stored,
+        # and such entries written by older versions are treated as misses.
+        # revalidate skips the lookup and overwrites the entry (except offline, where the cache is all there is).
+        value = None if revalidate and not self.offline else self.get(kind, parts, ttl)
+        if value is not None and cacheable is not None and not cacheable(value):
+            value = None
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if value is not None:
+            return value
+        if self.offline:
+            raise OfflineCacheMiss(f"{kind} {parts} not cached and SEC_OFFLINE is set")
+
+        value = fetch_fn()
+        if cacheable is not None and not cacheable(value):
+            logging.warning(f"Response cache: not storing incomplete {kind} response for {parts}")
+            return value
+        self.put(kind, parts, value)
+        logging.debug(f"Response cache: stored {kind} {parts}")
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.cache_dir, kind, key[:2], f"{key}.json")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    # One cache per process, shared by MappingApi, QueryApi and ExtractorApi
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -6,15 +6,82 @@ load_dotenv()
 # Gemini Configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 GEMINI_MODEL = 'gemini-1.5-pro'
+# Map step of the map-reduce agents: Gemini calls in flight at once (process-wide) and request quota
+LLM_MAP_CONCURRENCY = int(os.getenv('LLM_MAP_CONCURRENCY', '8'))
+GEMINI_REQUESTS_PER_SECOND = float(os.getenv('GEMINI_REQUESTS_PER_SECOND', '5'))
+GEMINI_BURST = int(os.getenv('GEMINI_BURST', '8'))
+# Relationship extraction: sentence batches sized by an estimated prompt token budget, sent concurrently
+RELATIONSHIP_BATCH_TOKENS = int(os.getenv('RELATIONSHIP_BATCH_TOKENS', '1000'))
+RELATIONSHIP_BATCH_CONCURRENCY = int(os.getenv('RELATIONSHIP_BATCH_CONCURRENCY', '4'))
 ALPHAVANTAGE_API_KEY = os.getenv('ALPHAVANTAGE_API_KEY')
 
 # SEC API Configuration
-SEC_BASE_URL = 'https://api.sec-api.io'
+SEC_BASE_URL = os.getenv('SEC_BASE_URL', 'https://api.sec-api.io')
 SEC_API_KEY = os.getenv('SEC_API_KEY', '')
+# Shared SEC-API client: connection pool size, timeouts (seconds) and request quota
+SEC_API_POOL_SIZE = int(os.getenv('SEC_API_POOL_SIZE', '10'))
+SEC_API_CONNECT_TIMEOUT = float(os.getenv('SEC_API_CONNECT_TIMEOUT', '5'))
+SEC_API_READ_TIMEOUT = float(os.getenv('SEC_API_READ_TIMEOUT', '60'))
+SEC_API_REQUESTS_PER_SECOND = float(os.getenv('SEC_API_REQUESTS_PER_SECOND', '10'))
+SEC_API_BURST = int(os.getenv('SEC_API_BURST', '10'))
+# On-disk SEC-API response cache. Section extracts never expire (a filed 10-K does not change);
+# filing searches and company-name lookups are refreshed after their TTL (seconds).
+SEC_CACHE_DIR = os.getenv('SEC_CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sec_cache'))
+SEC_FILINGS_CACHE_TTL = int(os.getenv('SEC_FILINGS_CACHE_TTL', str(24 * 3600)))
+SEC_MAPPING_CACHE_TTL = int(os.getenv('SEC_MAPPING_CACHE_TTL', str(30 * 24 * 3600)))
+# Offline mode: answer only from the response cache (expired entries included), never call SEC-API
+SEC_OFFLINE = os.getenv('SEC_OFFLINE', 'false').lower() == 'true'
+# Local ticker -> latest 10-K catalog; entries older than the TTL (seconds) are refreshed in the background
+FILING_CATALOG_PATH = os.getenv('FILING_CATALOG_PATH', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'filing_catalog.json'))
+FILING_CATALOG_TTL = int(os.getenv('FILING_CATALOG_TTL', str(24 * 3600)))
 
 # Rate limiting
 MAX_RETRIES = 3
 RETRY_DELAY = 1
+# Concurrent section extraction: worker threads per query and in-flight requests per host
+SECTION_FETCH_WORKERS = int(os.getenv('SECTION_FETCH_WORKERS', '4'))
+MAX_REQUESTS_PER_HOST = int(os.getenv('MAX_REQUESTS_PER_HOST', '4'))
+# Threads shared by all requests for pre-retrieval stages that run alongside company resolution
+PRE_RETRIEVAL_WORKERS = int(os.getenv('PRE_RETRIEVAL_WORKERS', '8'))
+
+# Chunking: "fixed" = overlapping CHUNK_SIZE_TOKENS windows; "structured" = whole paragraphs/sentences packed up to
+# CHUNK_SIZE_TOKENS with no overlap, tagged with the 10-K sub-heading they fall under
+CHUNKING_MODE = os.getenv('CHUNKING_MODE', 'fixed')
+CHUNK_SIZE_TOKENS = int(os.getenv('CHUNK_SIZE_TOKENS', '2500'))
+CHUNK_OVERLAP_TOKENS = int(os.getenv('CHUNK_OVERLAP_TOKENS', '200'))
+
+# Embeddings
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+# "torch" (sentence-transformers) or "onnx" (int8-quantized ONNX Runtime, CPU; exported on first use)
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch')
+ONNX_MODEL_DIR = os.getenv('ONNX_MODEL_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models'))
+# Optional shared embedding server (python -m core.embedding_sidecar); when set, workers call it instead of loading the model
+EMBEDDING_SIDECAR_URL = os.getenv('EMBEDDING_SIDECAR_URL', '')
+EMBEDDING_SIDECAR_TIMEOUT = float(os.getenv('EMBEDDING_SIDECAR_TIMEOUT', '60'))
+
+# Vector store
+# Memory budget for namespaces (FAISS index + chunk metadata) kept resident in RAM
+VECTOR_CACHE_MAX_BYTES = int(os.getenv('VECTOR_CACHE_MAX_MB', '512')) * 1024 * 1024
+# Number of query embeddings kept in the in-memory LRU
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv('QUERY_EMBEDDING_CACHE_SIZE', '2048'))
+
+# Index type for new namespaces: "flat" (exact), "hnsw", "ivf_flat" or "ivf_pq".
+# IVF indexes are trained on the first batch of chunks; nprobe/efSearch are search-time defaults.
+VECTOR_INDEX_TYPE = os.getenv('VECTOR_INDEX_TYPE', 'flat')
+VECTOR_INDEX_PARAMS = {
+    "hnsw": {"M": 32, "efConstruction": 200, "efSearch": 64},
+    "ivf_flat": {"nlist": 256, "nprobe": 16},
+    "ivf_pq": {"nlist": 256, "m": 16, "nbits": 8, "nprobe": 16},
+}
+
+# Optional cross-company index: every ingested chunk is mirrored into a sharded global index
+# (sharded by company, filterable by company_id/filing_year/section)
+GLOBAL_INDEX_ENABLED = os.getenv('GLOBAL_INDEX_ENABLED', 'false').lower() == 'true'
+GLOBAL_INDEX_SHARDS = int(os.getenv('GLOBAL_INDEX_SHARDS', '8'))
+GLOBAL_INDEX_TYPE = os.getenv('GLOBAL_INDEX_TYPE', 'hnsw')
+
+# Entity extraction: resolve tickers/company names in the query locally and call Gemini only when that finds nothing
+ENTITY_FAST_PATH_ENABLED = os.getenv('ENTITY_FAST_PATH_ENABLED', 'true').lower() == 'true'
 
 # Intent classification
 INTENTS = [
@@ -31,6 +98,12 @@ INTENT_SECTIONS = {
     "general_summary": ['1', '7']
 }
 DEFAULT_INTENT = 'general_summary'
+# "local": nearest-centroid classifier over MiniLM embeddings of data/intent_examples.json, falling back to
+# the Gemini router below INTENT_CONFIDENCE_THRESHOLD; "llm": always use the Gemini router
+INTENT_CLASSIFIER = os.getenv('INTENT_CLASSIFIER', 'local')
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv('INTENT_CONFIDENCE_THRESHOLD', '0.6'))
+INTENT_SOFTMAX_TEMPERATURE = 0.05
+INTENT_EXAMPLES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'intent_examples.json')
 
 # LangChain Router Configuration
 ROUTER_DESTINATIONS = [
@@ -51,6 +124,13 @@ ROUTER_DESTINATIONS = [
         "description": "Good for general questions about companies and broad business overviews"
     }
 ]
+# Relationship agent: spaCy NER over filing chunks (n_process > 1 forks worker processes for large filings)
+SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_sm')
+SPACY_BATCH_SIZE = int(os.getenv('SPACY_BATCH_SIZE', '16'))
+SPACY_N_PROCESS = int(os.getenv('SPACY_N_PROCESS', '1'))
+# Extract candidate sentences when relationship sections are ingested (saved as {namespace}_candidates.json)
+RELATIONSHIP_CANDIDATES_AT_INGESTION = os.getenv('RELATIONSHIP_CANDIDATES_AT_INGESTION', 'true').lower() == 'true'
+
 #neo4j config
 NEO4J_URI= os.getenv("NEO4J_URI")
 NEO4J_USERNAME=os.getenv("NEO4J_USERNAME")
@@ -0,0 +1,254 @@
+# core/chunk_store.py
+import json
+import mmap
+import os
+import pickle
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Fixed-width metadata columns: file name -> (metadata key, numpy dtype)
+# company_id/section are short ASCII identifiers (tickers, item numbers), years and ids are ints.
+COLUMNS = {
+    "company_id.S16": ("company_id", np.dtype("S16")),
+    "filing_year.i4": ("filing_year", np.dtype("<i4")),
+    "section.S8": ("section", np.dtype("S8")),
+    "chunk_id.i4": ("chunk_id", np.dtype("<i4")),
+}
+OFFSET_DTYPE = np.dtype("<i8")
+MISSING_INT = -1
+
+TEXT_BLOB = "text.bin"
+TEXT_OFFSETS = "text_offsets.i8"
+EXTRA_BLOB = "extra.bin"
+EXTRA_OFFSETS = "extra_offsets.i8"
+# Written last on every append, so its length is the authoritative row count
+COMMIT_COLUMN = "chunk_id.i4"
+
+
+def commit_path(store_path: str) -> str:
+    # File whose size/mtime changes on every append (used for cache invalidation); no store is opened
+    return os.path.join(store_path, COMMIT_COLUMN)
+
+
+def _split_metadata(metadata: Dict):
+    # Split chunk metadata into fixed-width column values and a JSON "extra" remainder.
+    # Values that do not fit their column (long ids, non-numeric years) go to extra, which wins on read.
+    fixed, extra = {}, {}
+    for file_name, (key, dtype) in COLUMNS.items():
+        value = metadata.get(key)
+        if dtype.kind == "S":
+            encoded = str(value).encode("ascii", "ignore") if value is not None else b""
+            fixed[key] = encoded[:dtype.itemsize]
+            if value is not None and (len(encoded) > dtype.itemsize or encoded.decode() != str(value)):
+                extra[key] = value
+        else:
+            try:
+                fixed[key] = int(value) if value is not None else MISSING_INT
+            except (TypeError, ValueError):
+                fixed[key] = MISSING_INT
+                extra[key] = value
+    for key, value in metadata.items():
+        if key not in fixed:
+            extra[key] = value
+    return fixed, extra
+
+
+class ChunkStore:
+    """Append-only columnar chunk store: one text blob, an offsets array and fixed-width metadata columns, read via mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._maps = {}
+        self._count = 0
+        if self.exists():
+            self._open()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.commit_path())
+
+    def commit_path(self) -> str:
+        return commit_path(self.path)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def nbytes(self) -> int:
+        # Resident overhead only — mapped pages belong to the OS page cache
+        return 64 * self._count + 4096
+
+    # ---------- reads ----------
+
+    def text(self, row: int) -> str:
+        return self._blob_slice(TEXT_BLOB, TEXT_OFFSETS, row).decode("utf-8")
+
+    def metadata(self, row: int) -> Dict:
+        metadata = {}
+        for file_name, (key, dtype) in COLUMNS.items():
+            value = self._maps[file_name][row]
+            if dtype.kind == "S":
+                if value:
+                    metadata[key] = value.decode("ascii")
+            elif value != MISSING_INT:
+                metadata[key] = int(value)
+        # Filing years are strings throughout the pipeline ("2024")
+        if "filing_year" in metadata:
+            metadata["filing_year"] = str(metadata["filing_year"])
+
+        raw_extra = self._blob_slice(EXTRA_BLOB, EXTRA_OFFSETS, row)
+        if raw_extra:
+            metadata.update(json.loads(raw_extra))
+        return metadata
+
+    def chunk(self, row: int) -> Dict:
+        return {"text": self.text(row), "metadata": self.metadata(row)}
+
+    def chunks(self, rows: Iterable[int]) -> List[Dict]:
+        return [self.chunk(int(row)) for row in rows]
+
+    def column(self, key: str) -> np.ndarray:
+        # Read-only view of a fixed-width metadata column, e.g. column("section")
+        for file_name, (column_key, _) in COLUMNS.items():
+            if column_key == key:
+                return self._maps[file_name][:self._count]
+        raise KeyError(f"No fixed-width column for metadata key {key}")
+
+    # ---------- writes ----------
+
+    def append(self, chunks: List[Dict]) -> int:
+        # Append chunks in O(len(chunks)); returns the row id of the first appended chunk.
+        os.makedirs(self.path, exist_ok=True)
+        self._close()
+        start_row = self._repair()
+
+        text_end = self._blob_size(TEXT_OFFSETS, start_row)
+        extra_end = self._blob_size(EXTRA_OFFSETS, start_row)
+        text_offsets, extra_offsets = [], []
+        columns = {file_name: [] for file_name in COLUMNS}
+
+        with open(self._file(TEXT_BLOB), "ab") as text_f, open(self._file(EXTRA_BLOB), "ab") as extra_f:
+            for chunk in chunks:
+                encoded = chunk.get("text", "").encode("utf-8")
+                text_f.write(encoded)
+                text_end += len(encoded)
+                text_offsets.append(text_end)
+
+                fixed, extra = _split_metadata(chunk.get("metadata", {}))
+                encoded_extra = json.dumps(extra).encode("utf-8") if extra else b""
+                extra_f.write(encoded_extra)
+                extra_end += len(encoded_extra)
+                extra_offsets.append(extra_end)
+
+                for file_name, (key, _) in COLUMNS.items():
+                    columns[file_name].append(fixed[key])
+
+        self._append_array(TEXT_OFFSETS, np.asarray(text_offsets, dtype=OFFSET_DTYPE))
+        self._append_array(EXTRA_OFFSETS, np.asarray(extra_offsets, dtype=OFFSET_DTYPE))
+        for file_name, (_, dtype) in COLUMNS.items():
+            if file_name != COMMIT_COLUMN:
+                self._append_array(file_name, np.asarray(columns[file_name], dtype=dtype))
+        self._append_array(COMMIT_COLUMN, np.asarray(columns[COMMIT_COLUMN], dtype=COLUMNS[COMMIT_COLUMN][1]))
+
+        self._open()
+        return start_row
+
+    def close(self):
+        self._close()
+
+    # ---------- internals ----------
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _rows_in(self, name: str, dtype: np.dtype) -> int:
+        path = self._file(name)
+        return os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+
+    def _open(self):
+        self._count = self._rows_in(COMMIT_COLUMN, COLUMNS[COMMIT_COLUMN][1])
+        for file_name, (_, dtype) in COLUMNS.items():
+            self._maps[file_name] = self._map_array(file_name, dtype)
+        self._maps[TEXT_OFFSETS] = self._map_array(TEXT_OFFSETS, OFFSET_DTYPE)
+        self._maps[EXTRA_OFFSETS] = self._map_array(EXTRA_OFFSETS, OFFSET_DTYPE)
+        self._maps[TEXT_BLOB] = self._map_blob(TEXT_BLOB)
+        self._maps[EXTRA_BLOB] = self._map_blob(EXTRA_BLOB)
+
+    def _close(self):
+        for name in (TEXT_BLOB, EXTRA_BLOB):
+            blob = self._maps.get(name)
+            if isinstance(blob, mmap.mmap):
+                blob.close()
+        self._maps = {}
+
+    def _map_array(self, name: str, dtype: np.dtype) -> np.ndarray:
+        rows = self._count
+        if rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=(rows,))
+
+    def _map_blob(self, name: str):
+        path = self._file(name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return b""
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _blob_slice(self, blob_name: str, offsets_name: str, row: int) -> bytes:
+        if not 0 <= row < self._count:
+            raise IndexError(f"Chunk row {row} out of range ({self._count} chunks)")
+        offsets = self._maps[offsets_name]
+        start = int(offsets[row - 1]) if row > 0 else 0
+        return self._maps[blob_name][start:int(offsets[row])]
+
+    def _blob_size(self, offsets_name: str, rows: int) -> int:
+        if rows == 0:
+            return 0
+        with open(self._file(offsets_name), "rb") as f:
+            f.seek((rows - 1) * OFFSET_DTYPE.itemsize)
+            return int(np.frombuffer(f.read(OFFSET_DTYPE.itemsize), dtype=OFFSET_DTYPE)[0])
+
+    def _append_array(self, name: str, values: np.ndarray):
+        with open(self._file(name), "ab") as f:
+            f.write(values.tobytes())
+
+    def _repair(self) -> int:
+        # Truncate every file back to the last fully committed row (recovers from a torn append)
+        rows = self._rows_in(COMMIT_COLUMN, COLUMNS[COMMIT_COLUMN][1])
+        for file_name, (_, dtype) in COLUMNS.items():
+            self._truncate(file_name, rows * dtype.itemsize)
+        self._truncate(TEXT_OFFSETS, rows * OFFSET_DTYPE.itemsize)
+        self._truncate(EXTRA_OFFSETS, rows * OFFSET_DTYPE.itemsize)
+        self._truncate(TEXT_BLOB, self._blob_size(TEXT_OFFSETS, rows))
+        self._truncate(EXTRA_BLOB, self._blob_size(EXTRA_OFFSETS, rows))
+        return rows
+
+    def _truncate(self, name: str, size: int):
+        path = self._file(name)
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        elif os.path.getsize(path) > size:
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+
+def migrate_meta_pkl(meta_path: str, store_path: str) -> int:
+    # Convert a legacy pickled chunk list ({namespace}_meta.pkl) into a ChunkStore; returns the chunk count
+    with open(meta_path, "rb") as f:
+        chunks = pickle.load(f)
+
+    normalized = []
+    for c in chunks:
+        if isinstance(c, dict) and "metadata" in c:
+            normalized.append({"text": c.get("text", ""), "metadata": c["metadata"]})
+        elif isinstance(c, dict):
+            # Metadata-only entries (see test/fix_faiss_metadata.py)
+            normalized.append({"text": "", "metadata": c})
+        else:
+            raise ValueError(f"Unexpected entry type in {meta_path}: {type(c)}")
+
+    store = ChunkStore(store_path)
+    if store.exists():
+        raise FileExistsError(f"Chunk store already exists at {store_path}")
+    store.append(normalized)
+    store.close()
+    return len(normalized)
@@ -1,17 +1,164 @@
 # core/chunker.py
+import re
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
 import tiktoken
 
-def chunk_text(text: str, size: int = 2500, overlap: int = 200, model_name: str = "gpt-3.5-turbo") -> list:
-    enc = tiktoken.encoding_for_model(model_name)
-    tokens = enc.encode(text)
 
-    chunks = []
+class Chunk(NamedTuple):
+    text: str
+    char_start: int  # offsets into the original text: text == original[char_start:char_end]
+    char_end: int
+    n_tokens: int
+    heading: Optional[str] = None  # sub-heading in effect where the chunk starts (structured mode only)
+
+
+# A paragraph runs from a non-space character to the next blank line
+PARAGRAPH_RE = re.compile(r"\S.*?(?=\n[ \t]*\n|\Z)", re.S)
+# Sentence ends: terminal punctuation followed by whitespace and an upper-case letter, digit, quote or bracket
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])[\"')\]]?\s+(?=[A-Z0-9\"'(\[])")
+HEADING_MAX_CHARS = 150
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name: str = "gpt-3.5-turbo"):
+    # Loading the BPE ranks is expensive, so each encoder is built once per process
+    return tiktoken.encoding_for_model(model_name)
+
+
+def iter_chunks(text: str, size: int = 2500, overlap: int = 200, model_name: str = "gpt-3.5-turbo") -> Iterator[Chunk]:
+    # Overlapping windows of `size` tokens, yielded as slices of the original text.
+    # Window boundaries are mapped to character offsets from byte lengths: the token stream is cut
+    # at every window start/end and each piece is byte-decoded once, so overlaps are never decoded
+    # twice and no window is decoded back to a string.
+    enc = get_encoding(model_name)
+    tokens = enc.encode_ordinary(text)
+    if not tokens:
+        return
+
+    windows = []
     start = 0
-    while start < len(tokens):
+    while True:
         end = min(start + size, len(tokens))
-        chunk_tokens = tokens[start:end]
-        chunk_text = enc.decode(chunk_tokens)
-        chunks.append(chunk_text)
+        windows.append((start, end))
+        if end == len(tokens):
+            break
         start += size - overlap
 
-    return chunks
+    boundaries = iter(sorted({b for window in windows for b in window}))
+    byte_offsets = {}
+    position, byte_offset = next(boundaries), 0
+    byte_offsets[position] = 0
+    to_char_start, to_char_end = _char_offset_maps(text)
+
+    for start, end in windows:
+        # Advance through the boundaries (in token order) up to this window's end
+        while position < end:
+            following = next(boundaries)
+            byte_offset += len(enc.decode_bytes(tokens[position:following]))
+            position = following
+            byte_offsets[position] = byte_offset
+        char_start = to_char_start(byte_offsets[start])
+        char_end = to_char_end(byte_offsets[end])
+        yield Chunk(text[char_start:char_end], char_start, char_end, end - start)
+
+
+def iter_structured_chunks(text: str, max_tokens: int = 2500, model_name: str = "gpt-3.5-turbo") -> Iterator[Chunk]:
+    # Chunks of whole paragraphs packed up to max_tokens, with no overlap. A sub-heading starts a new
+    # chunk once the current one is reasonably full, and is recorded as the chunk's heading.
+    # Paragraphs over the budget are packed by sentence; sentences over it fall back to token windows.
+    enc = get_encoding(model_name)
+    min_tokens = max_tokens // 4
+    heading = chunk_heading = None
+    chunk_start = chunk_end = None
+    headings_only = False
+    chunk_tokens = 0
+
+    for start, end, n_tokens in _structural_pieces(text, enc, max_tokens):
+        is_heading = _is_heading(text[start:end])
+        if chunk_start is not None and (chunk_tokens + n_tokens > max_tokens or (is_heading and chunk_tokens >= min_tokens)):
+            yield Chunk(text[chunk_start:chunk_end], chunk_start, chunk_end, chunk_tokens, chunk_heading)
+            chunk_start, chunk_tokens = None, 0
+        if is_heading:
+            heading = text[start:end].strip()
+        if chunk_start is None:
+            chunk_start, headings_only = start, True
+        if headings_only:
+            # "Item 1A. Risk Factors" followed by a sub-heading: the chunk is about the innermost one
+            chunk_heading = heading
+            headings_only = is_heading
+        chunk_end = end
+        chunk_tokens += n_tokens
+
+    if chunk_start is not None:
+        yield Chunk(text[chunk_start:chunk_end], chunk_start, chunk_end, chunk_tokens, chunk_heading)
+
+
+def chunk_text(text: str, size: int = 2500, overlap: int = 200, model_name: str = "gpt-3.5-turbo") -> list:
+    return [chunk.text for chunk in iter_chunks(text, size, overlap, model_name)]
+
+
+def count_tokens(text: str, model_name: str = "gpt-3.5-turbo") -> int:
+    return len(get_encoding(model_name).encode_ordinary(text))
+
+
+def _structural_pieces(text: str, enc, max_tokens: int):
+    # (char_start, char_end, n_tokens) of paragraphs, or of sentences / token windows for oversized ones
+    for match in PARAGRAPH_RE.finditer(text):
+        start, end = match.start(), match.end()
+        n_tokens = len(enc.encode_ordinary(match.group()))
+        if n_tokens <= max_tokens:
+            yield start, end, n_tokens
+            continue
+        for s_start, s_end in _sentence_spans(text, start, end):
+            sentence = text[s_start:s_end]
+            s_tokens = len(enc.encode_ordinary(sentence))
+            if s_tokens <= max_tokens:
+                yield s_start, s_end, s_tokens
+            else:
+                for window in iter_chunks(sentence, size=max_tokens, overlap=0):
+                    yield s_start + window.char_start, s_start + window.char_end, window.n_tokens
+
+
+def _sentence_spans(text: str, start: int, end: int) -> List[tuple]:
+    spans = []
+    for match in SENTENCE_END_RE.finditer(text, start, end):
+        spans.append((start, match.start() + len(match.group().rstrip())))
+        start = match.end()
+    spans.append((start, end))
+    return [(s, e) for s, e in spans if e > s]
+
+
+def _is_heading(paragraph: str) -> bool:
+    # 10-K sub-headings ("Risks Related to Our Business", "Liquidity and Capital Resources"):
+    # one short line, no sentence punctuation at the end, mostly capitalized words
+    line = paragraph.strip()
+    if not line or "\n" in line or len(line) > HEADING_MAX_CHARS or line[-1] in ".,;":
+        return False
+    words = [w for w in re.findall(r"[A-Za-z][A-Za-z'’-]*", line) if len(w) > 3]
+    if not words:
+        return False
+    return sum(w[0].isupper() for w in words) / len(words) >= 0.6
+
+
+def _char_offset_maps(text: str):
+    # UTF-8 byte offset -> character offset. A boundary inside a multi-byte character is widened
+    # to include that character (round down for window starts, up for window ends).
+    if text.isascii():
+        return int, int
+
+    data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    is_char_start = (data & 0xC0) != 0x80
+    starts_before = np.zeros(len(data) + 1, dtype=np.int64)
+    np.cumsum(is_char_start, out=starts_before[1:])
+
+    def to_start(b):
+        b = int(b)
+        return int(starts_before[b]) - (0 if b == len(data) or is_char_start[b] else 1)
+
+    def to_end(b):
+        return int(starts_before[int(b)])
+
+    return to_start, to_end
@@ -0,0 +1,117 @@
+# core/embedders.py
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+# all-MiniLM-L6-v2 truncates inputs at 256 word pieces
+MAX_SEQ_LENGTH = 256
+
+
+class Embedder(ABC):
+    """Text embedding backend used by the vector store (same call shape as SentenceTransformer.encode)."""
+
+    # Identifies the exact vectors a backend produces; embedding caches are keyed by it
+    name: str
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def get_sentence_embedding_dimension(self) -> int:
+        pass
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """PyTorch backend via sentence-transformers."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True, **kwargs)
+
+    def get_sentence_embedding_dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+
+class OnnxEmbedder(Embedder):
+    """int8-quantized ONNX Runtime backend for CPU-only hosts (mean pooling + L2 norm, as MiniLM does)."""
+
+    def __init__(self, model_name: str, model_dir: str):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.name = f"{model_name}/onnx-int8"
+        self.model_dir = model_dir
+        model_path = os.path.join(model_dir, "model_int8.onnx")
+        if not os.path.exists(model_path):
+            export_onnx_int8(model_name, model_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self._dim = self.session.get_outputs()[0].shape[-1]
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+        texts = list(texts)
+        # Sort by length so each batch pads to similar sizes, then restore the caller's order
+        order = np.argsort([-len(t) for t in texts])
+        out = np.empty((len(texts), self._dim), dtype="float32")
+        for start in range(0, len(texts), batch_size):
+            batch_ids = order[start:start + batch_size]
+            out[batch_ids] = self._encode_batch([texts[i] for i in batch_ids])
+        return out
+
+    def get_sentence_embedding_dimension(self):
+        return self._dim
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=MAX_SEQ_LENGTH, return_tensors="np")
+        feeds = {k: v.astype("int64") for k, v in encoded.items() if k in self.input_names}
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        mask = encoded["attention_mask"][..., None].astype("float32")
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+
+def export_onnx_int8(model_name: str, model_dir: str):
+    # One-off export of the sentence-transformers model to ONNX, then dynamic int8 weight quantization
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    logging.info(f"Exporting {model_name} to int8 ONNX in {model_dir}")
+    os.makedirs(model_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in sample]
+    fp32_path = os.path.join(model_dir, "model.onnx")
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[k] for k in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    quantize_dynamic(fp32_path, os.path.join(model_dir, "model_int8.onnx"), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(model_dir)
@@ -0,0 +1,146 @@
+# core/embedding_cache.py
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent chunk embedding cache keyed by (embedder name, sha256 of the chunk text)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.encoded = 0  # texts actually sent to the model (misses minus in-batch duplicates)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def encode(self, embedder, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        # Look every text up first, then encode only the distinct misses in one batch.
+        # Keyed by embedder.name, so torch and int8 ONNX vectors never mix.
+        model_name = embedder.name
+        keys = [text_hash(t) for t in texts]
+        found = self._get_many(model_name, list(set(keys)))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        hits = sum(1 for key in keys if key in found)
+        if missing:
+            vectors = embedder.encode(list(missing.values()), batch_size=batch_size, convert_to_numpy=True)
+            new = dict(zip(missing.keys(), np.asarray(vectors, dtype="float32")))
+            self._put_many(model_name, new)
+            found.update(new)
+
+        with self._lock:
+            self.hits += hits
+            self.misses += len(keys) - hits
+            self.encoded += len(missing)
+        logging.info(f"Embedding cache: {hits}/{len(keys)} hits, {len(missing)} encoded ({self.stats()['hit_rate']:.1%} overall)")
+
+        if not keys:
+            return np.empty((0, 0), dtype="float32")
+        return np.stack([found[key] for key in keys])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "encoded": self.encoded,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text_hash))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _get_many(self, model_name: str, keys: List[str]) -> dict:
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model_name, *batch],
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype="float32")
+        return found
+
+    def _put_many(self, model_name: str, vectors: dict):
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(model_name, key, vector.tobytes()) for key, vector in vectors.items()],
+            )
+            conn.commit()
+
+
+class QueryEmbeddingCache:
+    """In-memory LRU of query embeddings keyed by (embedder name, query text)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, embedder, queries: List[str]) -> np.ndarray:
+        # Cached queries are served from RAM; the distinct misses are encoded together in one batch
+        model_name = embedder.name
+        found = {}
+        with self._lock:
+            for query in queries:
+                vector = self._entries.get((model_name, query))
+                if vector is not None:
+                    self._entries.move_to_end((model_name, query))
+                    found[query] = vector
+            hits = sum(1 for q in queries if q in found)
+            self.hits += hits
+            self.misses += len(queries) - hits
+
+        missing = list(dict.fromkeys(q for q in queries if q not in found))
+        if missing:
+            vectors = np.asarray(embedder.encode(missing, convert_to_numpy=True), dtype="float32")
+            with self._lock:
+                for query, vector in zip(missing, vectors):
+                    vector.setflags(write=False)
+                    self._entries[(model_name, query)] = vector
+                    found[query] = vector
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return np.stack([found[q] for q in queries])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,116 @@
+# core/embedding_sidecar.py
+# Local embedding server shared by several API workers, so the model is resident once per box:
+#   python -m core.embedding_sidecar --port 8002
+#   EMBEDDING_SIDECAR_URL=http://127.0.0.1:8002 uvicorn main:app --workers 4 --port 8001
+import argparse
+import base64
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import numpy as np
+import requests
+
+from config.settings import EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_SIDECAR_TIMEOUT
+from core.embedders import Embedder
+
+
+class RemoteEmbedder(Embedder):
+    """Embedder that calls a running sidecar instead of loading the model in this process."""
+
+    def __init__(self, base_url: str, model_name: str = EMBEDDING_MODEL, timeout: float = EMBEDDING_SIDECAR_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._dim = None
+        self._name = None
+
+    @property
+    def name(self) -> str:
+        # The sidecar's backend decides the vectors (e.g. "all-MiniLM-L6-v2/onnx-int8")
+        if self._name is None:
+            self._name = self._info()["name"]
+        return self._name
+
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        response = self.session.post(
+            f"{self.base_url}/encode",
+            json={"model": self.model_name, "texts": list(texts), "batch_size": batch_size},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        vectors = np.frombuffer(base64.b64decode(data["vectors"]), dtype="float32")
+        return vectors.reshape(len(texts), data["dim"])
+
+    def get_sentence_embedding_dimension(self) -> int:
+        if self._dim is None:
+            self._dim = self._info()["dim"]
+        return self._dim
+
+    def _info(self) -> dict:
+        response = self.session.get(f"{self.base_url}/info", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def make_handler(embedder, model_name: str):
+    lock = threading.Lock()
+
+    class EmbeddingHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/info":
+                self.send_error(404)
+                return
+            self._send_json({"model": model_name, "name": embedder.name, "dim": embedder.get_sentence_embedding_dimension()})
+
+        def do_POST(self):
+            if self.path != "/encode":
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if body.get("model", model_name) != model_name:
+                self.send_error(400, f"Sidecar serves {model_name}, not {body.get('model')}")
+                return
+
+            # One encode at a time; the model already parallelizes within a batch
+            with lock:
+                vectors = embedder.encode(body["texts"], batch_size=body.get("batch_size", 32), convert_to_numpy=True)
+            vectors = np.asarray(vectors, dtype="float32").reshape(len(body["texts"]), -1)
+            self._send_json({"dim": vectors.shape[1], "vectors": base64.b64encode(vectors.tobytes()).decode("ascii")})
+
+        def _send_json(self, payload: dict):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return EmbeddingHandler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8002, model_name: str = EMBEDDING_MODEL, backend: str = EMBEDDING_BACKEND):
+    from core.model_registry import load_local_embedder
+
+    embedder = load_local_embedder(model_name, backend)
+    server = ThreadingHTTPServer((host, port), make_handler(embedder, model_name))
+    logging.info(f"Embedding sidecar serving {embedder.name} on http://{host}:{port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Shared local embedding server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND, choices=["torch", "onnx"])
+    args = parser.parse_args()
+    serve(args.host, args.port, args.model, args.backend)
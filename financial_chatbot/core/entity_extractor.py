@@ -1,25 +1,54 @@
 from utils.gemini_client import GeminiClient
 import re
 import logging
-from config.settings import ALPHAVANTAGE_API_KEY
+import threading
+from config.settings import ALPHAVANTAGE_API_KEY, ENTITY_FAST_PATH_ENABLED
 import requests
-import os
-import json
-import difflib
+from utils.ticker_index import get_ticker_index
 
 class EntityExtractor:
     def __init__(self):
         self.gemini = GeminiClient()
-        json_path = os.path.join(os.path.dirname(__file__), "../data/company_tickers.json")
-        try:
-            with open(json_path, "r") as f:
-                self.ticker_data = json.load(f)
-        except Exception as e:
-            logging.error(f"Could not load SEC ticker JSON: {e}")
-            self.ticker_data = {}
+        self.ticker_index = get_ticker_index()
+        self.fast_path_hits = 0
+        self.llm_calls = 0
+        self._stats_lock = threading.Lock()
 
         
     def extract_company_info(self, query: str) -> dict:
+        # Local gazetteer/ticker match first; Gemini only when it finds no single confident company
+        if ENTITY_FAST_PATH_ENABLED:
+            entity_info = self.extract_company_info_fast(query)
+            if entity_info:
+                with self._stats_lock:
+                    self.fast_path_hits += 1
+                logging.info(f"Entity fast path: {entity_info} ({self.stats()['fast_path_rate']:.1%} of queries)")
+                return entity_info
+
+        with self._stats_lock:
+            self.llm_calls += 1
+        return self.extract_company_info_llm(query)
+
+    def extract_company_info_fast(self, query: str) -> dict | None:
+        """Match the query against ticker symbols and company names without calling the LLM."""
+        # Several different companies, or only a bare ticker-like word, is ambiguous; let the LLM decide
+        entry = self.ticker_index.confident_company(query)
+        if entry is None:
+            return None
+        return {
+            'company': entry["title"],
+            'ticker': entry["ticker"]
+        }
+
+    def stats(self) -> dict:
+        total = self.fast_path_hits + self.llm_calls
+        return {
+            "fast_path": self.fast_path_hits,
+            "llm": self.llm_calls,
+            "fast_path_rate": self.fast_path_hits / total if total else 0.0,
+        }
+
+    def extract_company_info_llm(self, query: str) -> dict:
         
         prompt = f"""
         Extract the company name from this query.
@@ -54,39 +83,9 @@ class EntityExtractor:
             return {'company': None, 'ticker': None}
     
     def get_ticker_for_company(self, company_name: str) -> str | None:
-        """Match company name to ticker using SEC company_tickers.json with fuzzy matching."""
-        if not company_name or not self.ticker_data:
+        """Match company name to ticker: exact name, phrase, token overlap, then trigram fuzzy match."""
+        if not company_name or not len(self.ticker_index):
             return None
 
-        company_name_clean = company_name.lower().replace("inc.", "").strip()
-
-        best_match = None
-        max_token_overlap = 0
-
-        for entry in self.ticker_data.values():
-            sec_name = entry.get("title", "").lower().replace("inc.", "").strip()
-            ticker = entry.get("ticker")
-
-            # Exact or partial match
-            if sec_name == company_name_clean or company_name_clean in sec_name:
-                return ticker
-
-            # Token overlap
-            company_tokens = set(company_name_clean.split())
-            sec_tokens = set(sec_name.split())
-            token_overlap = len(company_tokens & sec_tokens)
-
-            if token_overlap > max_token_overlap:
-                max_token_overlap = token_overlap
-                best_match = ticker
-
-        # Fallback: Fuzzy match using difflib
-        if not best_match:
-            sec_titles = [entry["title"] for entry in self.ticker_data.values()]
-            close_matches = difflib.get_close_matches(company_name, sec_titles, n=1, cutoff=0.8)
-            if close_matches:
-                for entry in self.ticker_data.values():
-                    if entry["title"] == close_matches[0]:
-                        return entry["ticker"]
-
-        return best_match
\ No newline at end of file
+        entry = self.ticker_index.match_name(company_name)
+        return entry["ticker"] if entry else None
@@ -0,0 +1,120 @@
+# core/filing_catalog.py
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from api.query_api import QueryApi
+from config.settings import FILING_CATALOG_PATH, FILING_CATALOG_TTL
+from utils.helpers import file_lock
+
+# Filing fields the pipeline uses downstream
+FILING_FIELDS = ("accessionNo", "formType", "filedAt", "linkToFilingDetails", "cik", "ticker", "companyName")
+
+
+class FilingCatalog:
+    """Local ticker -> latest 10-K catalog, so warm queries skip the SEC-API filing search.
+
+    Entries older than ttl are still served, and a background refresh is scheduled
+    (stale-while-revalidate). Only tickers never seen before are looked up synchronously.
+    Saves merge with the file under a lock, so worker processes sharing it keep each other's entries.
+    """
+
+    def __init__(self, query_api: QueryApi = None, path: str = FILING_CATALOG_PATH, ttl: float = FILING_CATALOG_TTL):
+        self.query_api = query_api or QueryApi()
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = self._read()
+        self._refreshing = set()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="filing-catalog")
+
+    def latest_filing(self, company_data: dict) -> Optional[Dict]:
+        key = self._key(company_data)
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None:
+            return self.refresh(company_data, revalidate=False)
+        if time.time() - entry["refreshed_at"] > self.ttl:
+            self._refresh_in_background(company_data)
+        return entry["filing"]
+
+    def refresh(self, company_data: dict, revalidate: bool = True) -> Optional[Dict]:
+        # Look the latest 10-K up remotely and record it; on failure keep whatever was cached.
+        # Revalidation goes past the response cache, whose filing searches are up to a day old.
+        key = self._key(company_data)
+        filings = self.query_api.get_filings(company_data, revalidate=revalidate)
+        if not filings or not filings.get("filings"):
+            with self._lock:
+                entry = self._entries.get(key)
+            return entry["filing"] if entry else None
+
+        filing = {k: v for k, v in filings["filings"][0].items() if k in FILING_FIELDS}
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous and previous["filing"].get("accessionNo") != filing.get("accessionNo"):
+                logging.info(f"Filing catalog: new 10-K for {key} filed {filing.get('filedAt')}")
+            self._entries[key] = {
+                "filing": filing,
+                "company": {k: company_data[k] for k in ("ticker", "cik", "company_name") if company_data.get(k)},
+                "refreshed_at": time.time()
+            }
+            self._save()
+        return filing
+
+    def refresh_all(self):
+        # Re-check every catalogued ticker, e.g. from a periodic job
+        with self._lock:
+            companies = [entry["company"] for entry in self._entries.values()]
+        for company_data in companies:
+            self.refresh(company_data)
+
+    def _refresh_in_background(self, company_data: dict):
+        key = self._key(company_data)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(company_data)
+            except Exception as e:
+                logging.warning(f"Filing catalog refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._pool.submit(run)
+
+    def _key(self, company_data: dict) -> str:
+        ticker = company_data.get("ticker")
+        return ticker.upper() if ticker else str(company_data.get("cik"))
+
+    def _read(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logging.warning(f"Ignoring unreadable filing catalog {self.path}")
+            return {}
+
+    def _save(self):
+        # Caller holds the lock. Entries other processes wrote since this one loaded are merged in
+        # (the most recently refreshed entry per ticker wins) before the file is replaced.
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with file_lock(f"{self.path}.lock"):
+            for key, entry in self._read().items():
+                current = self._entries.get(key)
+                if current is None or entry["refreshed_at"] > current["refreshed_at"]:
+                    self._entries[key] = entry
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,209 @@
+# core/global_index.py
+import heapq
+import json
+import logging
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from config.settings import GLOBAL_INDEX_SHARDS, GLOBAL_INDEX_TYPE
+from core.vector_store import LocalFAISS
+from utils.helpers import file_lock
+
+
+def parse_namespace(namespace: str):
+    # "AAPL_2024_10k" -> ("AAPL", "2024")
+    ticker, year, _ = namespace.rsplit("_", 2)
+    return ticker, year
+
+
+class GlobalIndex:
+    """Sharded index over every ingested chunk, searchable across companies with metadata filters.
+
+    Chunks are sharded by company_id, so a company's filings always live in one shard and a
+    company-filtered search touches a single shard. Shards are ordinary LocalFAISS namespaces
+    under {db_dir}/global/. Writes run on one background thread per process and hold a file lock,
+    so several worker processes can mirror into the same shards.
+    """
+
+    def __init__(self, vector_store: LocalFAISS, num_shards: int = GLOBAL_INDEX_SHARDS, index_type: str = GLOBAL_INDEX_TYPE):
+        self.vector_store = vector_store
+        self.shards = LocalFAISS(os.path.join(vector_store.db_dir, "global"), embed_model=vector_store.embed_model)
+        self.num_shards = num_shards
+        self.index_type = index_type
+        self._registry_path = os.path.join(self.shards.db_dir, "namespaces.json")
+        self._lock_path = os.path.join(self.shards.db_dir, "write.lock")
+        # Mirrored writes are applied off the ingest path, in the order the store made them
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="global-writer")
+        self._pool = ThreadPoolExecutor(max_workers=num_shards, thread_name_prefix="global-shard")
+
+    def attach(self):
+        # Mirror every future create/add_chunks of the per-namespace store into the global index
+        self.vector_store.write_listeners.append(self.enqueue)
+        return self
+
+    def enqueue(self, namespace: str, chunks: List[Dict], embeddings: np.ndarray, replace: bool = False):
+        # Write listener: returns immediately, the shard write happens on the writer thread
+        future = self._writer.submit(self.add_chunks, namespace, chunks, embeddings, replace)
+        future.add_done_callback(
+            lambda f: f.exception() and logging.error(f"Global index write failed for {namespace}: {f.exception()}")
+        )
+
+    def flush(self):
+        # Wait for every queued write of this process
+        self._writer.submit(lambda: None).result()
+
+    def shard_for(self, company_id: str) -> str:
+        return f"shard_{zlib.crc32(str(company_id).encode()) % self.num_shards:03d}"
+
+    def namespaces(self) -> Dict[str, List[str]]:
+        # namespace -> sections already ingested into the global index
+        return self._read_registry()
+
+    # ---------- writes ----------
+
+    def add_chunks(self, namespace: str, chunks: List[Dict], embeddings: np.ndarray, replace: bool = False):
+        # Sections already ingested for a namespace are skipped, so mirroring the same write twice never
+        # duplicates rows. replace (the namespace was rebuilt) drops the namespace's existing rows first.
+        ticker, year = parse_namespace(namespace)
+        with file_lock(self._lock_path):
+            registry = self._read_registry()
+            if replace and namespace in registry:
+                self._remove_namespace(namespace)
+                del registry[namespace]
+            ingested = set(registry.get(namespace, []))
+
+            by_shard: Dict[str, List[int]] = {}
+            new_sections = set()
+            for i, chunk in enumerate(chunks):
+                section = str(chunk["metadata"].get("section"))
+                if section in ingested:
+                    continue
+                new_sections.add(section)
+                company_id = chunk["metadata"].get("company_id") or ticker
+                by_shard.setdefault(self.shard_for(company_id), []).append(i)
+
+            for shard, rows in by_shard.items():
+                shard_chunks = [{
+                    "text": chunks[i]["text"],
+                    "metadata": {
+                        "company_id": ticker,
+                        "filing_year": year,
+                        **chunks[i]["metadata"],
+                        "namespace": namespace,
+                    },
+                } for i in rows]
+                shard_embeddings = embeddings[rows]
+                if self.shards.exists(shard):
+                    self.shards.add_chunks(shard, shard_chunks, embeddings=shard_embeddings)
+                else:
+                    self.shards.create(shard, shard_chunks, index_type=self.index_type, embeddings=shard_embeddings)
+
+            if new_sections or replace:
+                registry[namespace] = sorted(ingested | new_sections)
+                self._save_registry(registry)
+                logging.info(f"Global index: added sections {sorted(new_sections)} of {namespace}")
+
+    def _remove_namespace(self, namespace: str):
+        # FAISS rows cannot be deleted in place: the namespace's shard is rebuilt from its other rows
+        # (stored vectors are reused, nothing is re-encoded)
+        ticker, year = parse_namespace(namespace)
+        shard = self.shard_for(ticker)
+        if not self.shards.exists(shard):
+            return
+        all_rows = self.shards.select_rows(shard)
+        keep = np.setdiff1d(all_rows, self.shards.select_rows(shard, filter_years=[year], filter_companies=[ticker]))
+        if len(keep) == len(all_rows):
+            return
+        if len(keep):
+            self.shards.create(shard, self.shards.get_chunks(shard, keep), index_type=self.index_type,
+                               embeddings=self.shards.get_embeddings(shard)[keep])
+        else:
+            self.shards.delete(shard)
+        logging.info(f"Global index: dropped {len(all_rows) - len(keep)} rows of rebuilt namespace {namespace}")
+
+    def backfill(self):
+        # Ingest every existing namespace of the per-namespace store (reuses stored vectors, no re-encoding)
+        for namespace in self.vector_store.list_namespaces():
+            if not self.vector_store.exists(namespace):
+                continue
+            rows = self.vector_store.select_rows(namespace)
+            chunks = self.vector_store.get_chunks(namespace, rows)
+            self.add_chunks(namespace, chunks, self.vector_store.get_embeddings(namespace))
+
+    # ---------- reads ----------
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        company_ids: List[str] = None,
+        filing_years: List[str] = None,
+        sections: List[str] = None,
+        nprobe: int = None,
+        ef_search: int = None
+    ) -> List[Dict]:
+        query_emb = self.vector_store.encode_queries([query])
+        hits = self.search_by_vector(query_emb, top_k, company_ids, filing_years, sections, nprobe, ef_search)
+        return [chunk for _, chunk in hits]
+
+    def search_by_vector(self, query_emb, top_k=5, company_ids=None, filing_years=None, sections=None,
+                         nprobe=None, ef_search=None) -> List[tuple]:
+        # Fan out to the relevant shards in parallel (FAISS releases the GIL) and merge the per-shard top-k
+        if company_ids:
+            shards = sorted({self.shard_for(c) for c in company_ids})
+        else:
+            shards = [f"shard_{i:03d}" for i in range(self.num_shards)]
+        shards = [s for s in shards if self.shards.exists(s)]
+
+        futures = [
+            self._pool.submit(self.shards.search_by_vector, shard, query_emb, top_k,
+                              sections, filing_years, company_ids, nprobe, ef_search)
+            for shard in shards
+        ]
+        hits = [hit for future in futures for hit in future.result()]
+        return heapq.nsmallest(top_k, hits, key=lambda hit: hit[0])
+
+    def view(self, namespace: str) -> "NamespaceView":
+        return NamespaceView(self, namespace)
+
+    def _read_registry(self) -> Dict[str, List[str]]:
+        if not os.path.exists(self._registry_path):
+            return {}
+        with open(self._registry_path, "r") as f:
+            return json.load(f)
+
+    def _save_registry(self, registry: Dict[str, List[str]]):
+        tmp_path = f"{self._registry_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(registry, f)
+        os.replace(tmp_path, self._registry_path)
+
+
+class NamespaceView:
+    """The per-namespace read API of LocalFAISS, answered from the global index."""
+
+    def __init__(self, global_index: GlobalIndex, namespace: str):
+        self.global_index = global_index
+        self.namespace = namespace
+        self.company_id, self.filing_year = parse_namespace(namespace)
+        self.shard = global_index.shard_for(self.company_id)
+
+    def exists(self) -> bool:
+        return self.namespace in self.global_index.namespaces()
+
+    def list_sections(self) -> List[str]:
+        return list(self.global_index.namespaces().get(self.namespace, []))
+
+    def search(self, query: str, top_k: int = 5, filter_sections: List[str] = None) -> List[Dict]:
+        return self.global_index.search(query, top_k, [self.company_id], [self.filing_year], filter_sections)
+
+    def get_chunks_by_section(self, section: str) -> List[Dict]:
+        shards = self.global_index.shards
+        if not shards.exists(self.shard):
+            return []
+        rows = shards.select_rows(self.shard, [section], [self.filing_year], [self.company_id])
+        return shards.get_chunks(self.shard, rows)
@@ -0,0 +1,93 @@
+# core/index_factory.py
+import logging
+import faiss
+import numpy as np
+from typing import Dict, Tuple
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+
+# FAISS k-means wants ~39 training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+def build_index(index_type: str, embeddings: np.ndarray, params: Dict = None) -> Tuple[object, Dict]:
+    # Build (and train, for IVF) an index from the first batch of embeddings.
+    # Returns the index and the parameters actually used, which are saved with the namespace.
+    params = dict(params or {})
+    n, dim = embeddings.shape
+
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown FAISS index type {index_type}, expected one of {INDEX_TYPES}")
+
+    if index_type == "ivf_pq" and n < 2 ** params.get("nbits", 8):
+        logging.warning(f"{n} chunks are too few to train PQ codebooks, using ivf_flat instead")
+        index_type = "ivf_flat"
+        params.pop("m", None)
+        params.pop("nbits", None)
+
+    if index_type == "flat":
+        return faiss.IndexFlatL2(dim), {"type": "flat", "dim": dim}
+
+    if index_type == "hnsw":
+        M = params.get("M", 32)
+        index = faiss.IndexHNSWFlat(dim, M)
+        index.hnsw.efConstruction = params.get("efConstruction", 200)
+        index.hnsw.efSearch = params.get("efSearch", 64)
+        return index, {"type": "hnsw", "dim": dim, "M": M,
+                       "efConstruction": index.hnsw.efConstruction, "efSearch": index.hnsw.efSearch}
+
+    # IVF: clamp the number of lists to what the training batch can support
+    nlist = max(1, min(params.get("nlist", 256), n // MIN_POINTS_PER_CENTROID))
+    quantizer = faiss.IndexFlatL2(dim)
+    if index_type == "ivf_flat":
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+        used = {"type": "ivf_flat", "dim": dim, "nlist": nlist}
+    else:
+        m = params.get("m", 16)
+        nbits = params.get("nbits", 8)
+        if dim % m:
+            raise ValueError(f"PQ sub-quantizers m={m} must divide embedding dim {dim}")
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, nbits)
+        used = {"type": "ivf_pq", "dim": dim, "nlist": nlist, "m": m, "nbits": nbits}
+
+    index.train(embeddings)
+    index.nprobe = min(params.get("nprobe", 16), nlist)
+    used["nprobe"] = index.nprobe
+    return index, used
+
+
+def apply_defaults(index, config: Dict):
+    # Restore search-time defaults that are not persisted by faiss.write_index
+    if config.get("type") == "hnsw":
+        index.hnsw.efSearch = config.get("efSearch", index.hnsw.efSearch)
+    elif config.get("type", "").startswith("ivf"):
+        index.nprobe = config.get("nprobe", index.nprobe)
+    return index
+
+
+def search_parameters(config: Dict, selector=None, nprobe: int = None, ef_search: int = None):
+    # Per-call search parameters (filter selector plus nprobe/efSearch overrides), None if nothing to set
+    kwargs = {}
+    if selector is not None:
+        kwargs["sel"] = selector
+
+    index_type = config.get("type", "flat")
+    if index_type.startswith("ivf"):
+        if nprobe:
+            kwargs["nprobe"] = nprobe
+        return faiss.SearchParametersIVF(**kwargs) if kwargs else None
+    if index_type == "hnsw":
+        if ef_search:
+            kwargs["efSearch"] = ef_search
+        return faiss.SearchParametersHNSW(**kwargs) if kwargs else None
+    return faiss.SearchParameters(**kwargs) if kwargs else None
+
+
+def exhaustive_overrides(config: Dict, index) -> Dict:
+    # nprobe/efSearch that make a filtered ANN search visit enough of the index to fill top_k
+    index_type = config.get("type", "flat")
+    if index_type.startswith("ivf"):
+        return {"nprobe": config.get("nlist", 1)}
+    if index_type == "hnsw":
+        return {"ef_search": max(1, min(index.ntotal, 4096))}
+    return {}
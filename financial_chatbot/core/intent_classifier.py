@@ -3,8 +3,10 @@ from langchain.prompts import PromptTemplate
 from langchain.chains.router.llm_router import LLMRouterChain, RouterOutputParser
 from langchain.chains.router.multi_prompt_prompt import MULTI_PROMPT_ROUTER_TEMPLATE
 
-from config.settings import GEMINI_API_KEY, ROUTER_DESTINATIONS, DEFAULT_INTENT
+from config.settings import GEMINI_API_KEY, ROUTER_DESTINATIONS, DEFAULT_INTENT, INTENT_CLASSIFIER, INTENT_CONFIDENCE_THRESHOLD
 import logging
+import threading
+from core.local_intent_classifier import CentroidIntentClassifier
 
 from agents.financial_agent import FinancialAgent
 from agents.general_agent import GeneralAgent
@@ -18,6 +20,12 @@ class LangChainRouter:
 
         self.llm = GeminiLangChain()
         self.router_chain = self._create_router_chain()
+        # Local embedding classifier answers confident queries; the LLM router handles the rest
+        self.local_classifier = CentroidIntentClassifier() if INTENT_CLASSIFIER == "local" else None
+        self.confidence_threshold = INTENT_CONFIDENCE_THRESHOLD
+        self.local_hits = 0
+        self.llm_calls = 0
+        self._stats_lock = threading.Lock()
 
         # Map intents to agents
         self.destination_agents = {
@@ -41,6 +49,23 @@ class LangChainRouter:
         return LLMRouterChain.from_llm(self.llm, router_prompt)
 
     def classify_intent(self, query: str) -> str:
+        if self.local_classifier is not None:
+            try:
+                intent, confidence = self.local_classifier.classify(query)
+                if confidence >= self.confidence_threshold:
+                    with self._stats_lock:
+                        self.local_hits += 1
+                    logging.info(f"Local intent classifier: {intent} ({confidence:.2f})")
+                    return intent
+                logging.info(f"Local intent classifier unsure ({intent}, {confidence:.2f}), asking the LLM router")
+            except Exception as e:
+                logging.error(f"Local intent classification failed: {e}")
+
+        with self._stats_lock:
+            self.llm_calls += 1
+        return self.classify_intent_llm(query)
+
+    def classify_intent_llm(self, query: str) -> str:
         try:
             output = self.router_chain.invoke({"input": query})
             return output.get("destination", DEFAULT_INTENT)
@@ -48,5 +73,13 @@ class LangChainRouter:
             logging.error(f"Intent classification failed: {e}")
             return DEFAULT_INTENT
 
+    def stats(self) -> dict:
+        total = self.local_hits + self.llm_calls
+        return {
+            "local": self.local_hits,
+            "llm": self.llm_calls,
+            "local_rate": self.local_hits / total if total else 0.0,
+        }
+
     def get_agent_for_intent(self, intent: str):
         return self.destination_agents.get(intent, self.destination_agents[DEFAULT_INTENT])
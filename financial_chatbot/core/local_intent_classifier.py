@@ -0,0 +1,68 @@
+# core/local_intent_classifier.py
+import json
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from config.settings import INTENT_EXAMPLES_PATH, INTENT_SOFTMAX_TEMPERATURE
+from core.model_registry import get_embedder
+from core.vector_store import query_embedding_cache
+
+
+class CentroidIntentClassifier:
+    """Nearest-centroid intent classifier over sentence embeddings of labeled example queries.
+
+    Uses the same embedder and query-embedding LRU as retrieval, so classifying a query also
+    warms the embedding its vector search will need. Confidence is the softmax probability of
+    the best intent over the cosine similarities to every centroid.
+    """
+
+    def __init__(self, examples_path: str = INTENT_EXAMPLES_PATH, embedder=None,
+                 temperature: float = INTENT_SOFTMAX_TEMPERATURE):
+        self.examples_path = examples_path
+        self.temperature = temperature
+        self._embedder = embedder
+        self._intents: List[str] = []
+        self._centroids = None
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def classify(self, query: str) -> Tuple[str, float]:
+        intent, confidence, _ = self.predict(query)
+        return intent, confidence
+
+    def predict(self, query: str) -> Tuple[str, float, Dict[str, float]]:
+        # (best intent, its probability, cosine similarity per intent)
+        centroids = self._get_centroids()
+        query_emb = _normalize(query_embedding_cache.encode(self.embedder, [query]))[0]
+        similarities = centroids @ query_emb
+
+        logits = similarities / self.temperature
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        best = int(np.argmax(probs))
+        return self._intents[best], float(probs[best]), dict(zip(self._intents, similarities.tolist()))
+
+    def _get_centroids(self) -> np.ndarray:
+        # Example embeddings are computed once per process, on the first query
+        with self._lock:
+            if self._centroids is None:
+                with open(self.examples_path, "r") as f:
+                    examples: Dict[str, List[str]] = json.load(f)
+                self._intents = list(examples)
+                vectors = []
+                for intent in self._intents:
+                    embeddings = _normalize(np.asarray(self.embedder.encode(examples[intent], convert_to_numpy=True), dtype="float32"))
+                    vectors.append(embeddings.mean(axis=0))
+                self._centroids = _normalize(np.stack(vectors))
+            return self._centroids
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
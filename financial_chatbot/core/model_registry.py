@@ -0,0 +1,43 @@
+# core/model_registry.py
+import logging
+import os
+import threading
+from config.settings import EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_SIDECAR_URL, ONNX_MODEL_DIR
+
+# One embedder per (model, backend) per process, created on first use
+_embedders = {}
+_lock = threading.Lock()
+
+
+def get_embedder(model_name: str = EMBEDDING_MODEL, backend: str = None):
+    backend = backend or EMBEDDING_BACKEND
+    key = (model_name, backend)
+    embedder = _embedders.get(key)
+    if embedder is not None:
+        return embedder
+
+    with _lock:
+        if key not in _embedders:
+            _embedders[key] = _load_embedder(model_name, backend)
+        return _embedders[key]
+
+
+def load_local_embedder(model_name: str, backend: str):
+    # Backend modules are imported here so that importing the vector store does not pull in torch/onnxruntime
+    if backend == "onnx":
+        from core.embedders import OnnxEmbedder
+        logging.info(f"Loading int8 ONNX embedding model {model_name}")
+        return OnnxEmbedder(model_name, os.path.join(ONNX_MODEL_DIR, f"{model_name}-onnx-int8"))
+    if backend == "torch":
+        from core.embedders import SentenceTransformerEmbedder
+        logging.info(f"Loading embedding model {model_name}")
+        return SentenceTransformerEmbedder(model_name)
+    raise ValueError(f"Unknown embedding backend {backend}, expected 'torch' or 'onnx'")
+
+
+def _load_embedder(model_name: str, backend: str):
+    if EMBEDDING_SIDECAR_URL:
+        from core.embedding_sidecar import RemoteEmbedder
+        logging.info(f"Using embedding sidecar at {EMBEDDING_SIDECAR_URL} for {model_name}")
+        return RemoteEmbedder(EMBEDDING_SIDECAR_URL, model_name)
+    return load_local_embedder(model_name, backend)
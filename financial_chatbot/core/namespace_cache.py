@@ -0,0 +1,97 @@
+# core/namespace_cache.py
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
+
+
+def _file_signature(path: str) -> Tuple[int, int] | None:
+    # (mtime, size) of a file — a stat call, not a read
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class NamespaceCache:
+    """Process-wide LRU cache of loaded vector store namespaces, bounded by a memory budget."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (value, nbytes, signature)
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_load(self, namespace: str, kind: str, path: str,
+                    loader: Callable[[], Any], sizeof: Callable[[Any], int]) -> Any:
+        # Serve (namespace, kind) from RAM as long as the backing file is unchanged on disk.
+        # The stat check keeps workers coherent when another process rewrites the namespace.
+        # Keys include the path, so stores in different directories never share a namespace's entries.
+        key = (namespace, kind, path)
+        signature = _file_signature(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = loader()
+        self.put(namespace, kind, path, value, sizeof(value), signature)
+        return value
+
+    def put(self, namespace: str, kind: str, path: str, value: Any, nbytes: int,
+            signature: Tuple[int, int] | None = None):
+        key = (namespace, kind, path)
+        if signature is None:
+            signature = _file_signature(path)
+
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                # Never cache a single entry larger than the whole budget
+                return
+            self._entries[key] = (value, nbytes, signature)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate(self, namespace: str, root: str | None = None):
+        # Drop every cached kind for a namespace (called whenever it is written),
+        # limited to entries whose files live under root when given
+        prefix = os.path.join(os.path.abspath(root), "") if root else None
+        with self._lock:
+            for key in [k for k in self._entries
+                        if k[0] == namespace and (prefix is None or os.path.abspath(k[2]).startswith(prefix))]:
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
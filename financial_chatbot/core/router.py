@@ -1,14 +1,22 @@
 # core/router.py
 import json
 import logging
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from core.intent_classifier import LangChainRouter
 from core.entity_extractor import EntityExtractor
 from api.mapping_api import MappingApi
 from api.query_api import QueryApi
 from api.extractor_api import ExtractorApi
-from config.settings import INTENT_SECTIONS
-from core.chunker import chunk_text
+from config.settings import (
+    INTENT_SECTIONS, GLOBAL_INDEX_ENABLED, SECTION_FETCH_WORKERS, PRE_RETRIEVAL_WORKERS,
+    CHUNKING_MODE, CHUNK_SIZE_TOKENS, CHUNK_OVERLAP_TOKENS, RELATIONSHIP_CANDIDATES_AT_INGESTION
+)
+from core.chunker import iter_chunks, iter_structured_chunks
 from core.vector_store import LocalFAISS
+from core.global_index import GlobalIndex
+from core.filing_catalog import FilingCatalog
 
 class Router:
     def __init__(self):
@@ -16,31 +24,41 @@ class Router:
         self.entity_extractor = EntityExtractor()
         self.mapping_api = MappingApi()
         self.query_api = QueryApi()
+        self.filing_catalog = FilingCatalog(self.query_api)
         self.extractor_api = ExtractorApi()
         self.vector_store = LocalFAISS()
+        # Optional cross-company index, kept in sync with every namespace write
+        self.global_index = GlobalIndex(self.vector_store).attach() if GLOBAL_INDEX_ENABLED else None
+        # Runs pre-retrieval stages that overlap with the request thread (intent classification)
+        self.stage_pool = ThreadPoolExecutor(max_workers=PRE_RETRIEVAL_WORKERS, thread_name_prefix="router-stage")
+        # Post-ingestion work (relationship candidate extraction) that does not block the response
+        self.ingest_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="router-ingest")
 
 
     def process_query(self, query: str) -> str:
-        # Step 1: Extract company info
-        entity_info = self.entity_extractor.extract_company_info(query)
-        company_data = self.mapping_api.resolve(entity_info)
+        started = time.perf_counter()
+        timings = {}
+
+        # Steps 1-2: Company extraction/resolution and intent classification are independent,
+        # so intent runs on a worker thread while this thread resolves the company
+        intent_future = self.stage_pool.submit(self._timed, timings, "intent_classification", self.langchain_router.classify_intent, query)
+        entity_info = self._timed(timings, "entity_extraction", self.entity_extractor.extract_company_info, query)
+        company_data = self._timed(timings, "company_resolution", self.mapping_api.resolve, entity_info)
         print(f"company_data:{company_data}")
         if not company_data:
             return "I couldn't identify the company from your query."
-
-        # Step 2: Classify intent
-        intent = self.langchain_router.classify_intent(query)
+        intent = intent_future.result()
+        timings["pre_retrieval"] = self._elapsed_ms(started)
         print (f'intent:{intent}')
         logging.info(f"Predicted intent: {intent}")
         sections = INTENT_SECTIONS.get(intent, ['1', '7', '1A'])
 
-        # Step 3: Get latest filing
-        filings = self.query_api.get_filings(company_data)
-        print(f'Filling:{json.dumps(filings, indent=2)[:2000]}')
-        if not filings or not filings.get('filings'):
+        # Step 3: Get latest filing (from the local catalog; only unseen tickers hit the filing search)
+        latest_filing = self._timed(timings, "filing_lookup", self.filing_catalog.latest_filing, company_data)
+        print(f'Filling:{json.dumps(latest_filing, indent=2)[:2000]}')
+        if not latest_filing:
             return f"Could not find recent 10-K filings for {company_data.get('company_name')}."
 
-        latest_filing = filings['filings'][0]
         filing_date = latest_filing.get('filedAt')
 
         if not filing_date:
@@ -50,13 +68,10 @@ class Router:
         namespace = f"{company_data['ticker']}_{filing_year}_10k"
 
         # Step 4: Check FAISS cache & required sections
-        missing_sections = []
+        step_started = time.perf_counter()
         if self.vector_store.exists(namespace):
             print(f"FAISS index exists for {namespace}. Checking required sections...")
-            existing_sections = self.vector_store.list_sections(namespace)
-            for sec in sections:
-                if str(sec) not in existing_sections:
-                    missing_sections.append(sec)
+            missing_sections = self.vector_store.missing_sections(namespace, sections)
             print (f"missing sections:{missing_sections}")
         else:
             print(f"No FAISS index found for {namespace}. Creating new one...")
@@ -68,37 +83,48 @@ class Router:
             if not filing_url:
                 return f"Filing URL not found for {company_data.get('company_name')}."
 
-            filing_chunks = []
-            for section in missing_sections:
-                print(f"Fetching section {section} from SEC API...")
-                section_text = self.extractor_api.extract_section(filing_url, section)
-                if section_text:
-                    for chunk_id, chunk in enumerate(chunk_text(section_text, size=2500, overlap=200)):
-                        filing_chunks.append({
-                            "text": chunk,
-                            "metadata": {
-                                "company_id": company_data['ticker'],
-                                "filing_year": filing_year,
-                                "section": section,
-                                "chunk_id": chunk_id
-                            }
-                        })
-
-            if filing_chunks:
-                if self.vector_store.exists(namespace):
-                    self.vector_store.add_chunks(namespace, filing_chunks)
-                else:
-                    self.vector_store.create(namespace, filing_chunks)
-            else:
+            # Fetch sections concurrently; each one is chunked and embedded as soon as it arrives.
+            # A new namespace is created once from all sections, so IVF indexes train on the whole filing
+            # rather than on whichever (possibly tiny) section arrived first.
+            stored_sections = []
+            new_namespace = not self.vector_store.exists(namespace)
+            pending_chunks, pending_embeddings = [], []
+            with ThreadPoolExecutor(max_workers=SECTION_FETCH_WORKERS) as pool:
+                futures = {}
+                for section in missing_sections:
+                    print(f"Fetching section {section} from SEC API...")
+                    futures[pool.submit(self.extractor_api.extract_section, filing_url, section)] = section
+
+                for future in as_completed(futures):
+                    section = futures[future]
+                    section_text = future.result()
+                    if not section_text:
+                        continue
+                    section_chunks = self._build_chunks(section_text, section, company_data['ticker'], filing_year)
+                    if new_namespace:
+                        pending_chunks.extend(section_chunks)
+                        pending_embeddings.append(self.vector_store.encode_chunks(section_chunks))
+                    else:
+                        self.vector_store.add_chunks(namespace, section_chunks)
+                    stored_sections.append(section)
+
+            if pending_chunks:
+                self.vector_store.create(namespace, pending_chunks, embeddings=np.vstack(pending_embeddings))
+
+            if not stored_sections:
                 logging.warning(f"No data fetched for sections {missing_sections} in {company_data.get('company_name')}.")
+            self._precompute_candidates(namespace, stored_sections)
         else:
             print(f"All required sections already exist for {namespace}.")
+        timings["section_ingestion"] = self._elapsed_ms(step_started)
 
 
         # Step 5: Route to appropriate agent
         agent = self.langchain_router.get_agent_for_intent(intent)
         # return agent.analyze(query, company_data, context)
-        raw_results = agent.retrieve_and_analyze(query, company_data, namespace, self.vector_store)
+        raw_results = self._timed(timings, "agent", agent.retrieve_and_analyze, query, company_data, namespace, self.vector_store)
+        timings["total"] = self._elapsed_ms(started)
+        logging.info(f"Stage timings (ms) for {namespace}: {timings}")
 
         if isinstance(raw_results, dict) and "relationships" in raw_results:
             data_type = "graph"
@@ -112,5 +138,52 @@ class Router:
             "company": company_data.get("company_name"),
             "data": raw_results,
             "data_type": data_type,
-            "success": True if raw_results else False
+            "success": True if raw_results else False,
+            "metadata": {"namespace": namespace, "timings_ms": timings}
         }
+
+    def _precompute_candidates(self, namespace: str, stored_sections: list):
+        # NER candidate sentences depend only on the filing, so they are extracted once per ingested section
+        relationship_sections = [sec for sec in stored_sections if sec in INTENT_SECTIONS.get("relationship_graph", [])]
+        if not RELATIONSHIP_CANDIDATES_AT_INGESTION or not relationship_sections:
+            return
+        agent = self.langchain_router.get_agent_for_intent("relationship_graph")
+        future = self.ingest_pool.submit(agent.ensure_candidates, namespace, self.vector_store, relationship_sections)
+        future.add_done_callback(
+            lambda f: f.exception() and logging.warning(f"Candidate extraction failed for {namespace}: {f.exception()}")
+        )
+
+    def _timed(self, timings: dict, stage: str, fn, *args):
+        # Run one pipeline stage and record its wall time in milliseconds
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            timings[stage] = self._elapsed_ms(started)
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    def _build_chunks(self, section_text: str, section: str, ticker: str, filing_year: str) -> list:
+        if CHUNKING_MODE == "structured":
+            chunks = iter_structured_chunks(section_text, max_tokens=CHUNK_SIZE_TOKENS)
+        else:
+            chunks = iter_chunks(section_text, size=CHUNK_SIZE_TOKENS, overlap=CHUNK_OVERLAP_TOKENS)
+
+        built = []
+        for chunk_id, chunk in enumerate(chunks):
+            metadata = {
+                "company_id": ticker,
+                "filing_year": filing_year,
+                "section": section,
+                "chunk_id": chunk_id,
+                # Position in the extracted section text, and the token count used by the manifest
+                "char_start": chunk.char_start,
+                "char_end": chunk.char_end,
+                "n_tokens": chunk.n_tokens
+            }
+            if chunk.heading:
+                metadata["heading"] = chunk.heading
+            built.append({"text": chunk.text, "metadata": metadata})
+        return built
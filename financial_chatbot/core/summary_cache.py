@@ -0,0 +1,78 @@
+# core/summary_cache.py
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# (section, chunk_id) of a chunk within its namespace
+ChunkKey = Tuple[str, int]
+
+
+class SummaryCache:
+    """Persistent per-chunk LLM summaries keyed by (namespace, section, chunk_id, prompt version, model).
+
+    The chunk text hash is stored too, so a summary is never served for text it was not made from.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get_many(self, namespace: str, keys: List[ChunkKey], text_hashes: List[str],
+                 prompt_version: str, model: str) -> List[Optional[str]]:
+        found: Dict[ChunkKey, Tuple[str, str]] = {}
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT section, chunk_id, text_hash, summary FROM summaries "
+                "WHERE namespace = ? AND prompt_version = ? AND model = ?",
+                (namespace, prompt_version, model),
+            )
+            for section, chunk_id, text_hash, summary in rows:
+                found[(section, chunk_id)] = (text_hash, summary)
+
+        summaries = []
+        for key, text_hash in zip(keys, text_hashes):
+            entry = found.get(key)
+            summaries.append(entry[1] if entry and entry[0] == text_hash else None)
+        hits = sum(1 for s in summaries if s is not None)
+        with self._lock:
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return summaries
+
+    def put_many(self, namespace: str, keys: List[ChunkKey], text_hashes: List[str], summaries: List[str],
+                 prompt_version: str, model: str):
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries "
+                "(namespace, section, chunk_id, prompt_version, model, text_hash, summary) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(namespace, section, chunk_id, prompt_version, model, text_hash, summary)
+                 for (section, chunk_id), text_hash, summary in zip(keys, text_hashes, summaries)],
+            )
+            conn.commit()
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM summaries WHERE namespace = ?", (namespace,))
+            conn.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "namespace TEXT NOT NULL, section TEXT NOT NULL, chunk_id INTEGER NOT NULL, "
+                "prompt_version TEXT NOT NULL, model TEXT NOT NULL, text_hash TEXT NOT NULL, summary TEXT NOT NULL, "
+                "PRIMARY KEY (namespace, section, chunk_id, prompt_version, model))"
+            )
+            self._conn.commit()
+        return self._conn
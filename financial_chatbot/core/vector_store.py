@@ -1,47 +1,173 @@
 # core/vector_store.py
 import faiss
-import pickle
+import json
+import logging
+import numpy as np
 import os
+import shutil
 from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+from config.settings import (VECTOR_CACHE_MAX_BYTES, VECTOR_INDEX_TYPE, VECTOR_INDEX_PARAMS,
+                             QUERY_EMBEDDING_CACHE_SIZE, EMBEDDING_MODEL)
+from core.chunk_store import ChunkStore, commit_path, migrate_meta_pkl
+from core.embedding_cache import EmbeddingCache, QueryEmbeddingCache, text_hash
+from core.summary_cache import SummaryCache
+from core.index_factory import build_index, apply_defaults, search_parameters, exhaustive_overrides
+from core.model_registry import get_embedder
+from core.chunker import count_tokens
+from core.namespace_cache import NamespaceCache
+
+# Shared by every LocalFAISS instance in the process
+namespace_cache = NamespaceCache(VECTOR_CACHE_MAX_BYTES)
+query_embedding_cache = QueryEmbeddingCache(QUERY_EMBEDDING_CACHE_SIZE)
+
+
+def _index_nbytes(index) -> int:
+    return index.ntotal * index.d * 4
+
+
+def _manifest_nbytes(manifest: Dict) -> int:
+    return 256 * (len(manifest["sections"]) + 1)
+
+
+def _candidates_nbytes(sections: Dict) -> int:
+    return 256 * (1 + sum(len(candidates) for candidates in sections.values()))
+
+
+def _id_selector(rows: np.ndarray):
+    # A contiguous row set (one section) is a range check, anything else a hashed id batch
+    if int(rows[-1]) - int(rows[0]) + 1 == len(rows):
+        return faiss.IDSelectorRange(int(rows[0]), int(rows[-1]) + 1)
+    return faiss.IDSelectorBatch(rows)
+
+
+def search_index(index, query_embs: np.ndarray, top_k: int, rows: np.ndarray = None,
+                 config: Dict = None, nprobe: int = None, ef_search: int = None):
+    # Search an index, restricted to the sorted row ids in `rows` (None = all rows).
+    # The restriction is applied inside FAISS, so up to top_k hits come back regardless of how rare the rows are.
+    # config is the namespace's index config (see core/index_factory.py); nprobe/ef_search override its defaults.
+    config = config or {"type": "flat"}
+    selector = None
+    if rows is not None:
+        if len(rows) == 0:
+            return np.empty((len(query_embs), 0), dtype="float32"), np.empty((len(query_embs), 0), dtype="int64")
+        top_k = min(top_k, len(rows))
+        if len(rows) < index.ntotal:
+            selector = _id_selector(rows)
+    top_k = min(top_k, index.ntotal)
+
+    params = search_parameters(config, selector, nprobe, ef_search)
+    D, I = index.search(query_embs, top_k, params=params) if params is not None else index.search(query_embs, top_k)
+
+    if selector is not None and (I < 0).any() and config.get("type", "flat") != "flat":
+        # An ANN probe can miss a small filtered subset: widen the search once
+        params = search_parameters(config, selector, **exhaustive_overrides(config, index))
+        D, I = index.search(query_embs, top_k, params=params)
+    return D, I
+
+
+def _extend_manifest(manifest: Dict, chunks: List[Dict], start_row: int) -> Dict:
+    # Section manifest: section -> contiguous row ranges [start, end) in the index, chunk count and token total.
+    # Rows are index positions, so a section lookup never has to scan or decode chunk text.
+    sections = manifest["sections"]
+    for row, chunk in enumerate(chunks, start=start_row):
+        section = chunk.get("metadata", {}).get("section")
+        if not section:
+            continue
+        entry = sections.setdefault(str(section), {"ranges": [], "count": 0, "tokens": 0})
+        ranges = entry["ranges"]
+        if ranges and ranges[-1][1] == row:
+            ranges[-1][1] = row + 1
+        else:
+            ranges.append([row, row + 1])
+        entry["count"] += 1
+        entry["tokens"] += chunk["metadata"].get("n_tokens") or count_tokens(chunk.get("text", ""))
+    manifest["total_chunks"] = start_row + len(chunks)
+    return manifest
 
 class LocalFAISS:
-    def __init__(self, db_dir=None, embed_model="all-MiniLM-L6-v2"):
+    def __init__(self, db_dir=None, embed_model=EMBEDDING_MODEL, embedder=None):
         # Always store in project_root/vector_db if db_dir not provided
         if not db_dir:
             project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             db_dir = os.path.join(project_root, "vector_db")
 
         self.db_dir = db_dir
+        self.embed_model = embed_model
         os.makedirs(self.db_dir, exist_ok=True)
 
-        self.embedder = SentenceTransformer(embed_model)
+        # Loaded on first encode from the process-wide registry, so constructing a store is cheap
+        self._embedder = embedder
+        # Chunk embeddings survive namespace rebuilds and are shared by identical text across filings
+        self.embedding_cache = EmbeddingCache(os.path.join(self.db_dir, "embedding_cache.sqlite"))
+        # Per-chunk LLM summaries of the map-reduce agents, dropped whenever a namespace is rebuilt
+        self.summary_cache = SummaryCache(os.path.join(self.db_dir, "summary_cache.sqlite"))
+
+        # Called as listener(namespace, chunks, embeddings, replace) after every create/add_chunks (e.g. GlobalIndex);
+        # replace is True for create, which discards whatever the namespace held before
+        self.write_listeners = []
         
 
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder(self.embed_model)
+        return self._embedder
+
     def _get_paths(self, namespace):
-        return os.path.join(self.db_dir, f"{namespace}.index"), os.path.join(self.db_dir, f"{namespace}_meta.pkl")
+        # FAISS index file and the chunk store directory (see core/chunk_store.py)
+        return os.path.join(self.db_dir, f"{namespace}.index"), os.path.join(self.db_dir, f"{namespace}.chunks")
+
+    def _get_legacy_meta_path(self, namespace):
+        return os.path.join(self.db_dir, f"{namespace}_meta.pkl")
+
+    def _get_manifest_path(self, namespace):
+        return os.path.join(self.db_dir, f"{namespace}_sections.json")
+
+    def _get_index_config_path(self, namespace):
+        return os.path.join(self.db_dir, f"{namespace}_index.json")
+
+    def _get_candidates_path(self, namespace):
+        return os.path.join(self.db_dir, f"{namespace}_candidates.json")
 
     def exists(self, namespace: str) -> bool:
-        index_path, meta_path = self._get_paths(namespace)
-        return os.path.exists(index_path) and os.path.exists(meta_path)
+        index_path, store_path = self._get_paths(namespace)
+        if not os.path.exists(index_path):
+            return False
+        if os.path.exists(commit_path(store_path)):
+            return True
+        return self._migrate_legacy_meta(namespace)
 
-    def create(self, namespace: str, chunks: List[Dict]):
+    def create(self, namespace: str, chunks: List[Dict], index_type: str = None, index_params: Dict = None,
+               embeddings: np.ndarray = None):
 
         # Create a FAISS index for chunks and save locally.
         # chunks: [{"text": str, "metadata": dict}, ...]
+        # index_type: "flat" | "hnsw" | "ivf_flat" | "ivf_pq" (defaults to VECTOR_INDEX_TYPE); IVF trains on these chunks
+        # embeddings: precomputed chunk embeddings, encoded here when not given
        
-        texts = [c["text"] for c in chunks]
-        embeddings = self.embedder.encode(texts, convert_to_numpy=True)
+        if embeddings is None:
+            embeddings = self.encode_chunks(chunks)
 
-        dim = embeddings.shape[1]
-        index = faiss.IndexFlatL2(dim)
+        index_type = index_type or VECTOR_INDEX_TYPE
+        index, config = build_index(index_type, embeddings, index_params or VECTOR_INDEX_PARAMS.get(index_type))
         index.add(embeddings)
 
         # Save index & metadata
-        index_path, meta_path = self._get_paths(namespace)
+        index_path, store_path = self._get_paths(namespace)
         faiss.write_index(index, index_path)
-        with open(meta_path, "wb") as f:
-            pickle.dump(chunks, f)
+        self._save_index_config(namespace, config)
+        shutil.rmtree(store_path, ignore_errors=True)
+        ChunkStore(store_path).append(chunks)
+        # Precomputed per-section artifacts describe the previous chunks
+        candidates_path = self._get_candidates_path(namespace)
+        if os.path.exists(candidates_path):
+            os.remove(candidates_path)
+        manifest = _extend_manifest({"sections": {}}, chunks, 0)
+        self._save_manifest(namespace, manifest)
+
+        self._cache_namespace(namespace, index, manifest)
+        self.summary_cache.invalidate(namespace)
+        self._notify_write(namespace, chunks, embeddings, replace=True)
 
     # def search(self, namespace: str, query: str, top_k: int = 5) -> List[Dict]:
    
@@ -61,81 +187,333 @@ class LocalFAISS:
         namespace: str,
         query: str,
         top_k: int = 5,
-        filter_sections: List[str] = None
+        filter_sections: List[str] = None,
+        filter_years: List[str] = None,
+        nprobe: int = None,
+        ef_search: int = None
     ) -> List[Dict]:
-        index_path, meta_path = self._get_paths(namespace)
-        index = faiss.read_index(index_path)
-        with open(meta_path, "rb") as f:
-            chunks = pickle.load(f)
-
-        query_emb = self.embedder.encode([query], convert_to_numpy=True)
-        D, I = index.search(query_emb, top_k * 3)  # Retrieve more to allow filtering
-
-        results = []
-        for i in I[0]:
-            if i < len(chunks):
-                chunk = chunks[i]
-                if not filter_sections or chunk["metadata"].get("section") in filter_sections:
-                    results.append(chunk)
-                if len(results) >= top_k:
-                    break
-
-        return results
-
-    def add_chunks(self, namespace: str, chunks: list):
-        #Add new chunks to an existing FAISS index.
+        # nprobe (IVF) / ef_search (HNSW) trade recall for latency per call; ignored by flat indexes
+        return self.search_many(namespace, [query], top_k, filter_sections, filter_years, nprobe, ef_search)[0]
+
+    def search_many(
+        self,
+        namespace: str,
+        queries: List[str],
+        top_k: int = 5,
+        filter_sections: List[str] = None,
+        filter_years: List[str] = None,
+        nprobe: int = None,
+        ef_search: int = None
+    ) -> List[List[Dict]]:
+        #Search several queries at once: one encode batch and one FAISS search over the query matrix.
+        if not queries:
+            return []
+        query_embs = self.encode_queries(queries)
+        hits = self._search_vectors(namespace, query_embs, top_k, filter_sections, filter_years,
+                                    nprobe=nprobe, ef_search=ef_search)
+        return [[chunk for _, chunk in row] for row in hits]
+
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        #Query embeddings through the process-wide LRU; misses are encoded in a single batch.
+        return query_embedding_cache.encode(self.embedder, queries)
+
+    def encode_chunks(self, chunks: List[Dict]) -> np.ndarray:
+        #Chunk embeddings, served from the embedding cache where the text was seen before.
         texts = [c["text"] for c in chunks]
-        embeddings = self.embedder.encode(texts, convert_to_numpy=True)
+        return self.embedding_cache.encode(self.embedder, texts)
+
+    def search_by_vector(
+        self,
+        namespace: str,
+        query_emb: np.ndarray,
+        top_k: int = 5,
+        filter_sections: List[str] = None,
+        filter_years: List[str] = None,
+        filter_companies: List[str] = None,
+        nprobe: int = None,
+        ef_search: int = None
+    ) -> List[tuple]:
+        #Search with an already-encoded query (shape (1, dim)); returns [(distance, chunk), ...] nearest first.
+        return self._search_vectors(namespace, query_emb, top_k, filter_sections, filter_years,
+                                    filter_companies, nprobe, ef_search)[0]
 
-        # Load FAISS index
+    def _search_vectors(self, namespace, query_embs, top_k, filter_sections=None, filter_years=None,
+                        filter_companies=None, nprobe=None, ef_search=None) -> List[List[tuple]]:
+        # One index.search for the whole (n_queries, dim) matrix; one hit list per query
         index = self._load_faiss_index(namespace)
+        chunks = self._load_chunks(namespace)
+        rows = self._select_rows(namespace, filter_sections, filter_years, filter_companies)
+
+        D, I = search_index(index, query_embs, top_k, rows, self.get_index_config(namespace), nprobe, ef_search)
+
+        return [
+            [(float(d), chunks.chunk(int(i))) for d, i in zip(D_row, I_row) if 0 <= i < len(chunks)]
+            for D_row, I_row in zip(D, I)
+        ]
+
+    def add_chunks(self, namespace: str, chunks: list, embeddings: np.ndarray = None):
+        #Add new chunks to an existing FAISS index.
+        if embeddings is None:
+            embeddings = self.encode_chunks(chunks)
+
+        # Read fresh from disk — the cached copies are shared with concurrent readers
+        index = self._read_faiss_index(namespace)
         index.add(embeddings)
 
-        # Update metadata — keep full chunk structure
-        _, meta_path = self._get_paths(namespace)
-        with open(meta_path, "rb") as f:
-            existing_chunks = pickle.load(f)
+        # Append metadata — only the new chunks are written
+        _, store_path = self._get_paths(namespace)
+        store = ChunkStore(store_path)
+        start_row = store.append(chunks)
 
-        existing_chunks.extend(chunks)  # ✅ store full dict objects
-        with open(meta_path, "wb") as f:
-            pickle.dump(existing_chunks, f)
+        manifest = self._read_manifest(namespace)
+        if manifest is None or manifest.get("total_chunks") != start_row:
+            manifest = self._build_manifest(store)
+        else:
+            manifest = _extend_manifest(manifest, chunks, start_row)
+        self._save_manifest(namespace, manifest)
 
         # Save updated FAISS index
         self._save_faiss_index(namespace, index)
+        self._cache_namespace(namespace, index, manifest)
+        self._notify_write(namespace, chunks, embeddings)
+
+    def delete(self, namespace: str):
+        # Remove every file of a namespace
+        index_path, store_path = self._get_paths(namespace)
+        for path in (index_path, self._get_manifest_path(namespace), self._get_index_config_path(namespace),
+                     self._get_candidates_path(namespace)):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(store_path, ignore_errors=True)
+        namespace_cache.invalidate(namespace, self.db_dir)
+        self.summary_cache.invalidate(namespace)
+
+    def list_namespaces(self) -> List[str]:
+        #All namespaces with an index in db_dir.
+        return sorted(f[:-len(".index")] for f in os.listdir(self.db_dir) if f.endswith(".index"))
+
+    def get_embeddings(self, namespace: str) -> np.ndarray:
+        #Stored vectors of a namespace (exact for flat/HNSW/IVF-Flat, PQ-approximate for IVF-PQ).
+        index = self._read_faiss_index(namespace)
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.make_direct_map()
+        return index.reconstruct_n(0, index.ntotal)
+
+    def _notify_write(self, namespace: str, chunks: List[Dict], embeddings: np.ndarray, replace: bool = False):
+        for listener in self.write_listeners:
+            try:
+                listener(namespace, chunks, embeddings, replace)
+            except Exception as e:
+                logging.error(f"Write listener failed for {namespace}: {e}")
     
     def list_sections(self, namespace: str):
        #Return a list of unique section IDs stored in this namespace.
         if not self.exists(namespace):
             return []
-        _, metadata_path = self._get_paths(namespace)
-        with open(metadata_path, "rb") as f:
-            chunks = pickle.load(f)
-        # Each chunk is a dict with {"text": str, "metadata": {...}}
-        return list({str(c.get("metadata", {}).get("section")) for c in chunks if c.get("metadata", {}).get("section")})
+        return list(self.get_manifest(namespace)["sections"])
+
+    def missing_sections(self, namespace: str, sections: List[str]) -> List[str]:
+        #Return the requested sections that are not stored yet (all of them if the namespace does not exist).
+        if not self.exists(namespace):
+            return list(sections)
+        stored = self.get_manifest(namespace)["sections"]
+        return [sec for sec in sections if str(sec) not in stored]
+
+    def section_chunk_ids(self, namespace: str, section: str) -> List[int]:
+        #Index row ids of a section, straight from the manifest.
+        if not self.exists(namespace):
+            return []
+        entry = self.get_manifest(namespace)["sections"].get(str(section))
+        if not entry:
+            return []
+        return [row for start, end in entry["ranges"] for row in range(start, end)]
+
+    def select_rows(self, namespace: str, filter_sections: List[str] = None, filter_years: List[str] = None,
+                    filter_companies: List[str] = None) -> np.ndarray:
+        #Row ids matching the filters, in insertion order (every row when unfiltered).
+        rows = self._select_rows(namespace, filter_sections, filter_years, filter_companies)
+        return np.arange(len(self._load_chunks(namespace)), dtype="int64") if rows is None else rows
+
+    def get_chunks(self, namespace: str, rows) -> List[Dict]:
+        #Chunks at the given row ids.
+        return self._load_chunks(namespace).chunks(rows)
+
+    def get_column(self, namespace: str, key: str, rows=None) -> np.ndarray:
+        #Fixed-width metadata column ("company_id", "filing_year", "section", "chunk_id") without touching chunk text.
+        column = self._load_chunks(namespace).column(key)
+        return column if rows is None else column[rows]
+
+    def _select_rows(self, namespace: str, filter_sections: List[str] = None, filter_years: List[str] = None,
+                     filter_companies: List[str] = None):
+        # Sorted row ids matching the section/year/company filters, or None when unfiltered
+        rows = None
+        if filter_sections:
+            stored = self.get_manifest(namespace)["sections"]
+            ranges = [r for sec in filter_sections for r in stored.get(str(sec), {}).get("ranges", [])]
+            rows = np.unique(np.concatenate([np.arange(start, end, dtype="int64") for start, end in ranges] or [np.empty(0, dtype="int64")]))
+        if filter_years:
+            years = self._load_chunks(namespace).column("filing_year")
+            year_rows = np.flatnonzero(np.isin(years, [int(y) for y in filter_years])).astype("int64")
+            rows = year_rows if rows is None else np.intersect1d(rows, year_rows)
+        if filter_companies:
+            companies = self._load_chunks(namespace).column("company_id")
+            wanted = [str(c).encode("ascii", "ignore") for c in filter_companies]
+            company_rows = np.flatnonzero(np.isin(companies, wanted)).astype("int64")
+            rows = company_rows if rows is None else np.intersect1d(rows, company_rows)
+        return rows
+
+    def get_manifest(self, namespace: str) -> Dict:
+        #Section manifest of a namespace: {"total_chunks": int, "sections": {section: {"ranges", "count", "tokens"}}}
+        manifest_path = self._get_manifest_path(namespace)
+
+        def load_manifest():
+            manifest = self._read_manifest(namespace)
+            if manifest is None:
+                # Namespaces written before manifests existed: build once from the chunk metadata
+                manifest = self._build_manifest(self._load_chunks(namespace))
+                self._save_manifest(namespace, manifest)
+            return manifest
+
+        return namespace_cache.get_or_load(namespace, "manifest", manifest_path, loader=load_manifest, sizeof=_manifest_nbytes)
+
+    def _build_manifest(self, store: ChunkStore) -> Dict:
+        return _extend_manifest({"sections": {}}, store.chunks(range(len(store))), 0)
+
+    def _read_manifest(self, namespace: str) -> Dict | None:
+        manifest_path = self._get_manifest_path(namespace)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+
+    def _save_manifest(self, namespace: str, manifest: Dict):
+        manifest_path = self._get_manifest_path(namespace)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, manifest_path)
 
 
 
     def _load_faiss_index(self, namespace: str):
-        #load existing faiss index
+        #load faiss index, served from the process-wide cache when unchanged on disk
+        index_path, _ = self._get_paths(namespace)
+        return namespace_cache.get_or_load(
+            namespace, "index", index_path,
+            loader=lambda: self._read_faiss_index(namespace),
+            sizeof=_index_nbytes,
+        )
+
+    def _read_faiss_index(self, namespace: str):
+        #load existing faiss index from disk
         index_path, _ = self._get_paths(namespace)
         if not os.path.exists(index_path):
             raise FileNotFoundError(f"No FAISS index found for namespace {namespace}")
-        return faiss.read_index(index_path)
+        return apply_defaults(faiss.read_index(index_path), self.get_index_config(namespace))
+
+    def get_index_config(self, namespace: str) -> Dict:
+        #Index type and parameters the namespace was built with (flat for namespaces that predate the config file)
+        config_path = self._get_index_config_path(namespace)
+
+        def read_config():
+            if not os.path.exists(config_path):
+                return {"type": "flat"}
+            with open(config_path, "r") as f:
+                return json.load(f)
+
+        return namespace_cache.get_or_load(namespace, "index_config", config_path, loader=read_config, sizeof=lambda c: 256)
+
+    def _save_index_config(self, namespace: str, config: Dict):
+        with open(self._get_index_config_path(namespace), "w") as f:
+            json.dump(config, f)
+
+    def _load_chunks(self, namespace: str) -> ChunkStore:
+        #open the mmap-backed chunk store, served from the process-wide cache when unchanged on disk
+        _, store_path = self._get_paths(namespace)
+        return namespace_cache.get_or_load(
+            namespace, "chunks", commit_path(store_path),
+            loader=lambda: ChunkStore(store_path),
+            sizeof=lambda s: s.nbytes(),
+        )
+
+    def _migrate_legacy_meta(self, namespace: str) -> bool:
+        # Namespaces written before the chunk store keep their chunks in {namespace}_meta.pkl
+        meta_path = self._get_legacy_meta_path(namespace)
+        if not os.path.exists(meta_path):
+            return False
+        _, store_path = self._get_paths(namespace)
+        count = migrate_meta_pkl(meta_path, store_path)
+        logging.info(f"Migrated {count} chunks of {namespace} from {meta_path} to {store_path}")
+        return True
+
+    def _cache_namespace(self, namespace: str, index, manifest: Dict):
+        # Drop stale entries, then keep the freshly written namespace hot
+        namespace_cache.invalidate(namespace, self.db_dir)
+        index_path, store_path = self._get_paths(namespace)
+        store = ChunkStore(store_path)
+        namespace_cache.put(namespace, "index", index_path, index, _index_nbytes(index))
+        namespace_cache.put(namespace, "chunks", commit_path(store_path), store, store.nbytes())
+        namespace_cache.put(namespace, "manifest", self._get_manifest_path(namespace), manifest, _manifest_nbytes(manifest))
     
     def _save_faiss_index(self, namespace: str, index):
         
         index_path, _ = self._get_paths(namespace)
         faiss.write_index(index, index_path)
 
+    def get_summaries(self, namespace: str, chunks: List[Dict], prompt_version: str, model: str) -> List[str | None]:
+        # Cached summary per chunk (None where missing), keyed by the chunk's section/chunk_id
+        summaries = [None] * len(chunks)
+        positions, keys, hashes = self._summary_keys(chunks)
+        for i, summary in zip(positions, self.summary_cache.get_many(namespace, keys, hashes, prompt_version, model)):
+            summaries[i] = summary
+        return summaries
+
+    def save_summaries(self, namespace: str, chunks: List[Dict], summaries: List[str], prompt_version: str, model: str):
+        positions, keys, hashes = self._summary_keys(chunks)
+        self.summary_cache.put_many(namespace, keys, hashes, [summaries[i] for i in positions], prompt_version, model)
+
+    def _summary_keys(self, chunks: List[Dict]):
+        # Chunks without a chunk_id (e.g. migrated from old metadata) have no stable key and are never cached
+        positions = [i for i, c in enumerate(chunks) if c["metadata"].get("chunk_id") is not None]
+        keys = [(str(chunks[i]["metadata"].get("section")), int(chunks[i]["metadata"]["chunk_id"])) for i in positions]
+        return positions, keys, [text_hash(chunks[i]["text"]) for i in positions]
+
+    def get_candidates(self, namespace: str) -> Dict:
+        # Relationship candidate sentences extracted at ingestion: {section: [{"text", "entities"}]}
+        candidates_path = self._get_candidates_path(namespace)
+
+        def read_candidates():
+            if not os.path.exists(candidates_path):
+                return {}
+            with open(candidates_path, "r") as f:
+                return json.load(f)["sections"]
+
+        return namespace_cache.get_or_load(
+            namespace, "candidates", candidates_path, loader=read_candidates,
+            sizeof=_candidates_nbytes,
+        )
+
+    def save_candidates(self, namespace: str, section_candidates: Dict[str, List[Dict]]):
+        # Merged into the namespace's artifact, which is kept hot in the namespace cache
+        sections = dict(self.get_candidates(namespace))
+        sections.update({str(sec): candidates for sec, candidates in section_candidates.items()})
+        candidates_path = self._get_candidates_path(namespace)
+        tmp_path = f"{candidates_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"sections": sections}, f)
+        os.replace(tmp_path, candidates_path)
+        namespace_cache.put(namespace, "candidates", candidates_path, sections, _candidates_nbytes(sections))
+
     def get_chunks_by_section(self, namespace: str, section: str):
       
         if not self.exists(namespace):
             return []
 
-        _, meta_path = self._get_paths(namespace)
-
-        with open(meta_path, "rb") as f:
-            chunks = pickle.load(f)
+        entry = self.get_manifest(namespace)["sections"].get(str(section))
+        if not entry:
+            return []
 
-        # Filter by section metadata
-        return [c for c in chunks if c["metadata"].get("section") == section]
\ No newline at end of file
+        # Read the section's row ranges straight from the mmap-backed store
+        chunks = self._load_chunks(namespace)
+        return [chunks.chunk(row) for start, end in entry["ranges"] for row in range(start, end)]
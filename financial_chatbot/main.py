@@ -1,9 +1,27 @@
 from fastapi import FastAPI, Query
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, Optional
+import threading
 from core.router import Router
 # uvicorn main:app --reload --port 8001
-router_instance = Router()
+# With several workers, run one shared embedding model: python -m core.embedding_sidecar --port 8002
+# and start uvicorn with EMBEDDING_SIDECAR_URL=http://127.0.0.1:8002
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> Router:
+    # Built on the first request rather than at import, so worker startup stays cheap.
+    # Locked, so simultaneous first requests in the threadpool build (and load the model) once.
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = Router()
+    return _router
+
 
 app = FastAPI(
     title="Financial Analysis API",
@@ -20,9 +38,11 @@ class QueryResponse(BaseModel):
     data: Any
     data_type: str
     success: bool
+    # namespace and per-stage timings_ms of the pipeline
+    metadata: Optional[dict] = None
 
 @app.post("/finance_chatbot", response_model=QueryResponse)
 def analyze_query(request: QueryRequest):
     """Analyze a company question and return structured response."""
-    result = router_instance.process_query(request.query)
+    result = get_router().process_query(request.query)
     return result
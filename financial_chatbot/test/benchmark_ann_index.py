@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import VECTOR_INDEX_PARAMS
+from core.index_factory import build_index
+from core.vector_store import search_index
+
+# recall@k vs. latency for the FAISS index types LocalFAISS can build.
+# The corpus is synthetic: unit-norm 384-d vectors drawn around topic centroids, which is
+# roughly how MiniLM chunk embeddings of many filings cluster.
+# Usage: python test/benchmark_ann_index.py [n_chunks]
+
+DIM = 384
+TOP_K = 10
+N_QUERIES = 500
+N_TOPICS = 200
+
+SWEEPS = {
+    "flat": [{}],
+    "hnsw": [{"ef_search": ef} for ef in (16, 32, 64, 128, 256)],
+    "ivf_flat": [{"nprobe": p} for p in (1, 4, 8, 16, 32, 64)],
+    "ivf_pq": [{"nprobe": p} for p in (1, 4, 8, 16, 32, 64)],
+}
+
+
+def synthetic_corpus(n, rng):
+    centroids = rng.standard_normal((N_TOPICS, DIM)).astype("float32")
+    topics = rng.integers(0, N_TOPICS, size=n)
+    vectors = centroids[topics] + 0.6 * rng.standard_normal((n, DIM)).astype("float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall_at_k(I, ground_truth):
+    return np.mean([len(set(row) & set(gt)) / len(gt) for row, gt in zip(I, ground_truth)])
+
+
+if __name__ == "__main__":
+    n_chunks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    corpus = synthetic_corpus(n_chunks, rng)
+    queries = synthetic_corpus(N_QUERIES, rng)
+
+    exact, _ = build_index("flat", corpus)
+    exact.add(corpus)
+    _, ground_truth = exact.search(queries, TOP_K)
+
+    print(f"{n_chunks} chunks, {N_QUERIES} queries, recall@{TOP_K}")
+    print(f"{'index':<10} {'setting':<16} {'build s':>8} {'recall':>8} {'ms/query':>9}")
+    for index_type, sweep in SWEEPS.items():
+        start = time.perf_counter()
+        # Train on the first batch only, as LocalFAISS.create does
+        index, config = build_index(index_type, corpus[:min(n_chunks, 50_000)], VECTOR_INDEX_PARAMS.get(index_type))
+        index.add(corpus)
+        build_s = time.perf_counter() - start
+
+        for overrides in sweep:
+            start = time.perf_counter()
+            _, I = search_index(index, queries, TOP_K, config=config, **overrides)
+            ms = (time.perf_counter() - start) * 1000 / N_QUERIES
+            setting = ", ".join(f"{k}={v}" for k, v in overrides.items()) or "exact"
+            print(f"{index_type:<10} {setting:<16} {build_s:>8.1f} {recall_at_k(I, ground_truth):>8.3f} {ms:>9.3f}")
@@ -0,0 +1,75 @@
+import sys
+import os
+import random
+import time
+import faiss
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import EMBEDDING_MODEL
+from core.model_registry import load_local_embedder
+from core.vector_store import LocalFAISS
+
+# Encode throughput (chunks/sec) of the PyTorch and int8 ONNX backends on real chunk text,
+# plus how often they agree on retrieval (overlap of top-k neighbours for the same queries).
+# Usage: python test/benchmark_embedders.py [namespace]   (default AAPL_2024_10k, must already be ingested)
+
+TOP_K = 5
+N_QUERIES = 50
+QUERIES = [
+    "What are the main risk factors?",
+    "How did revenue change compared to last year?",
+    "Supply chain and manufacturing dependencies",
+    "Competition in the markets the company operates in",
+    "Liquidity and capital resources",
+]
+
+
+def throughput(embedder, texts, runs=2):
+    embedder.encode(texts[:8])  # warm-up
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        vectors = embedder.encode(texts, batch_size=32)
+        best = min(best, time.perf_counter() - start)
+    return np.asarray(vectors, dtype="float32"), len(texts) / best
+
+
+def top_k(vectors, queries):
+    index = faiss.IndexFlatL2(vectors.shape[1])
+    index.add(vectors)
+    _, I = index.search(queries, TOP_K)
+    return I
+
+
+if __name__ == "__main__":
+    namespace = sys.argv[1] if len(sys.argv) > 1 else "AAPL_2024_10k"
+    vector_store = LocalFAISS()
+    if not vector_store.exists(namespace):
+        print(f"Namespace {namespace} not found, ingest it first (e.g. test/router_faiss.py)")
+        sys.exit()
+
+    texts = [c["text"] for c in vector_store.get_chunks(namespace, vector_store.select_rows(namespace)) if c["text"].strip()]
+    random.seed(0)
+    # Real questions plus first sentences of random chunks as queries
+    queries = QUERIES + [t.split(". ")[0][:300] for t in random.sample(texts, min(N_QUERIES, len(texts)))]
+    print(f"{namespace}: {len(texts)} chunks, {len(queries)} queries\n")
+
+    results = {}
+    for backend in ("torch", "onnx"):
+        embedder = load_local_embedder(EMBEDDING_MODEL, backend)
+        vectors, chunks_per_sec = throughput(embedder, texts)
+        query_vectors = np.asarray(embedder.encode(queries), dtype="float32")
+        results[backend] = (vectors, top_k(vectors, query_vectors))
+        print(f"{embedder.name:<32} {chunks_per_sec:8.1f} chunks/sec")
+
+    torch_vecs, torch_I = results["torch"]
+    onnx_vecs, onnx_I = results["onnx"]
+    cosine = np.sum(torch_vecs * onnx_vecs, axis=1) / (
+        np.linalg.norm(torch_vecs, axis=1) * np.linalg.norm(onnx_vecs, axis=1))
+    overlap = np.mean([len(set(a) & set(b)) / TOP_K for a, b in zip(torch_I, onnx_I)])
+    top1 = np.mean(torch_I[:, 0] == onnx_I[:, 0])
+
+    print(f"\nMean cosine(torch, onnx) per chunk: {cosine.mean():.4f} (min {cosine.min():.4f})")
+    print(f"Retrieval agreement: top-{TOP_K} overlap {overlap:.3f}, top-1 match {top1:.3f}")
@@ -0,0 +1,71 @@
+import sys
+import os
+import time
+import faiss
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.vector_store import search_index
+
+# Compares section-filtered search: the old "over-fetch top_k * 3 then filter in Python"
+# against the selector pushed into FAISS (core.vector_store.search_index).
+# Synthetic 10-K-like layout: a few big sections and one small one (the filter target).
+
+DIM = 384
+TOP_K = 7
+N_QUERIES = 200
+SECTION_SIZES = {"1": 4000, "1A": 150, "7": 3000, "8": 2850}
+
+
+def overfetch_search(index, section_ids, wanted, query_embs, top_k):
+    D, I = index.search(query_embs, top_k * 3)
+    results = []
+    for row in I:
+        hits = [i for i in row if i >= 0 and section_ids[i] == wanted][:top_k]
+        results.append(hits)
+    return results
+
+
+def selector_search(index, rows, query_embs, top_k):
+    D, I = search_index(index, query_embs, top_k, rows)
+    return [[i for i in row if i >= 0] for row in I]
+
+
+def recall(results, ground_truth):
+    return np.mean([len(set(r) & set(g)) / len(g) for r, g in zip(results, ground_truth)])
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - start) * 1000 / N_QUERIES
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    section_ids = np.concatenate([np.full(n, sec, dtype=object) for sec, n in SECTION_SIZES.items()])
+    embeddings = rng.standard_normal((len(section_ids), DIM)).astype("float32")
+    queries = rng.standard_normal((N_QUERIES, DIM)).astype("float32")
+
+    index = faiss.IndexFlatL2(DIM)
+    index.add(embeddings)
+
+    for wanted in SECTION_SIZES:
+        rows = np.flatnonzero(section_ids == wanted).astype("int64")
+
+        # Exact top-k within the section is the ground truth
+        sub_index = faiss.IndexFlatL2(DIM)
+        sub_index.add(embeddings[rows])
+        _, sub_I = sub_index.search(queries, TOP_K)
+        ground_truth = [list(rows[r]) for r in sub_I]
+
+        old, old_ms = timed(overfetch_search, index, section_ids, wanted, queries, TOP_K)
+        new, new_ms = timed(selector_search, index, rows, queries, TOP_K)
+
+        share = len(rows) / len(section_ids)
+        print(f"Section {wanted:>2} ({share:6.1%} of index)")
+        print(f"  over-fetch : recall@{TOP_K}={recall(old, ground_truth):.3f}  "
+              f"avg hits={np.mean([len(r) for r in old]):.2f}  {old_ms:.3f} ms/query")
+        print(f"  selector   : recall@{TOP_K}={recall(new, ground_truth):.3f}  "
+              f"avg hits={np.mean([len(r) for r in new]):.2f}  {new_ms:.3f} ms/query")
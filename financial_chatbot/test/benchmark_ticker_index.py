@@ -0,0 +1,71 @@
+import sys
+import os
+import json
+import difflib
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ticker_index import TickerIndex, TICKERS_PATH
+
+# Per-lookup latency of the prebuilt TickerIndex vs the linear scans it replaced
+# (MappingApi._resolve_by_ticker and EntityExtractor.get_ticker_for_company).
+# Usage: python test/benchmark_ticker_index.py
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "JPM", "KO", "ZZZZ"]
+NAMES = ["Apple", "Microsoft Corporation", "nvidia", "JPMorgan Chase", "Coca-Cola", "Berkshire Hathway", "Unknown Widgets Xyz"]
+
+
+def linear_ticker(ticker_data, ticker):
+    for entry in ticker_data.values():
+        if entry.get("ticker") == ticker.upper():
+            return entry.get("ticker")
+    return None
+
+
+def linear_name(ticker_data, company_name):
+    company_name_clean = company_name.lower().replace("inc.", "").strip()
+    best_match, max_token_overlap = None, 0
+    for entry in ticker_data.values():
+        sec_name = entry.get("title", "").lower().replace("inc.", "").strip()
+        if sec_name == company_name_clean or company_name_clean in sec_name:
+            return entry.get("ticker")
+        token_overlap = len(set(company_name_clean.split()) & set(sec_name.split()))
+        if token_overlap > max_token_overlap:
+            max_token_overlap, best_match = token_overlap, entry.get("ticker")
+    if not best_match:
+        close = difflib.get_close_matches(company_name, [e["title"] for e in ticker_data.values()], n=1, cutoff=0.8)
+        if close:
+            return next(e["ticker"] for e in ticker_data.values() if e["title"] == close[0])
+    return best_match
+
+
+def per_call_us(fn, inputs, runs=20):
+    start = time.perf_counter()
+    for _ in range(runs):
+        for value in inputs:
+            fn(value)
+    return (time.perf_counter() - start) / (runs * len(inputs)) * 1e6
+
+
+if __name__ == "__main__":
+    with open(TICKERS_PATH, "r") as f:
+        ticker_data = json.load(f)
+
+    start = time.perf_counter()
+    index = TickerIndex(ticker_data)
+    print(f"Built index over {len(index)} entries in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    def indexed_name(name):
+        entry = index.match_name(name)
+        return entry["ticker"] if entry else None
+
+    print(f"{'query':<24} {'linear':>8} {'index':>8}")
+    for name in NAMES:
+        print(f"{name:<24} {str(linear_name(ticker_data, name)):>8} {str(indexed_name(name)):>8}")
+
+    print(f"\n{'lookup':<16} {'linear us':>12} {'index us':>12}")
+    print(f"{'ticker':<16} {per_call_us(lambda t: linear_ticker(ticker_data, t), TICKERS):12.1f} "
+          f"{per_call_us(index.lookup_ticker, TICKERS):12.2f}")
+    print(f"{'company name':<16} {per_call_us(lambda n: linear_name(ticker_data, n), NAMES, runs=2):12.1f} "
+          f"{per_call_us(indexed_name, NAMES):12.2f}")
@@ -0,0 +1,72 @@
+import sys
+import os
+import time
+import logging
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import INTENT_CONFIDENCE_THRESHOLD
+from core.local_intent_classifier import CentroidIntentClassifier
+
+# Accuracy and latency of the local centroid classifier vs the Gemini LLM router on held-out queries
+# (none of these appear in data/intent_examples.json), plus the hybrid used by LangChainRouter.
+# Usage: python test/compare_intent_classifiers.py [--local-only]
+
+EVAL_SET = [
+    ("Tell me about Tesla's risk factors", "risk_analysis"),
+    ("What threats could disrupt Apple's supply chain?", "risk_analysis"),
+    ("Is Nvidia exposed to export control regulations?", "risk_analysis"),
+    ("What keeps Microsoft's management up at night?", "risk_analysis"),
+    ("Which lawsuits could hurt Meta?", "risk_analysis"),
+    ("How much money did Amazon make last year?", "financial_status"),
+    ("What is Apple's revenue growth?", "financial_status"),
+    ("Is Intel losing money?", "financial_status"),
+    ("How leveraged is Ford's balance sheet?", "financial_status"),
+    ("What were Netflix's operating cash flows?", "financial_status"),
+    ("What companies are related to Tesla", "relationship_graph"),
+    ("Who supplies chips to Apple?", "relationship_graph"),
+    ("Which businesses does Alphabet own?", "relationship_graph"),
+    ("Show Microsoft's partnerships", "relationship_graph"),
+    ("Who are Boeing's key customers and suppliers?", "relationship_graph"),
+    ("What does Nvidia do?", "general_summary"),
+    ("Give me an overview of Coca-Cola", "general_summary"),
+    ("Tell me about Walmart", "general_summary"),
+    ("Describe Adobe's business", "general_summary"),
+    ("What markets does Caterpillar serve?", "general_summary"),
+]
+
+
+def evaluate(name, classify):
+    correct, latencies = 0, []
+    for query, expected in EVAL_SET:
+        start = time.perf_counter()
+        predicted = classify(query)
+        latencies.append(time.perf_counter() - start)
+        correct += predicted == expected
+        if predicted != expected:
+            print(f"  [{name}] {query!r}: got {predicted}, expected {expected}")
+    latencies.sort()
+    print(f"{name:<10} accuracy {correct / len(EVAL_SET):6.1%}   "
+          f"p50 {latencies[len(latencies) // 2] * 1000:8.1f} ms   max {latencies[-1] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    local = CentroidIntentClassifier()
+
+    start = time.perf_counter()
+    local.classify("warm up")
+    print(f"Local classifier ready in {time.perf_counter() - start:.2f}s (model load + example centroids)\n")
+
+    confident = sum(local.classify(q)[1] >= INTENT_CONFIDENCE_THRESHOLD for q, _ in EVAL_SET)
+    print(f"Confident (>= {INTENT_CONFIDENCE_THRESHOLD}) on {confident}/{len(EVAL_SET)} queries")
+    evaluate("local", lambda q: local.classify(q)[0])
+
+    if "--local-only" in sys.argv:
+        sys.exit()
+
+    from core.intent_classifier import LangChainRouter
+    router = LangChainRouter()
+    evaluate("llm", router.classify_intent_llm)
+    evaluate("hybrid", router.classify_intent)
+    print(f"Hybrid routing: {router.stats()}")
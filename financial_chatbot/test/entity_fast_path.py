@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.ticker_index import get_ticker_index
+
+# Queries the entity fast path must answer locally (expected ticker) or leave to Gemini (None).
+# Bare tickers of 3-5 letters resolve; acronyms that are also listed tickers (IP = International Paper,
+# EU = enCore Energy, FCF = First Commonwealth) must not.
+# Usage: python test/entity_fast_path.py
+CASES = [
+    ("Tell me about Apple's financial status", "AAPL"),
+    ("What are the risk factors for $NVDA?", "NVDA"),
+    ("Summarize Microsoft revenue growth", "MSFT"),
+    ("How does AAPL describe Apple supply chain risks?", "AAPL"),
+    ("Summarize IP litigation risks", None),
+    ("How exposed is revenue to the EU?", None),
+    ("What is the FCF margin trend?", None),
+    ("How fast is ARR growing?", None),
+    ("Is PC and TV demand slowing?", None),
+    ("Show LTM revenue and DEI targets", None),
+    ("How much API revenue is recurring?", None),
+    ("What are the main risks for AAPL?", "AAPL"),
+    ("NVDA revenue", "NVDA"),
+    ("What is NVDA revenue?", "NVDA"),
+    ("TSLA financials", "TSLA"),
+    ("Coca-Cola revenue", "KO"),
+    ("Risks for Coca-Cola Co", "KO"),
+    ("Tell me about T-Mobile", "TMUS"),
+    ("What does BRK.B own?", "BRK-B"),
+    ("What does BRK-B own?", "BRK-B"),
+    ("Compare Apple and Microsoft margins", None),
+]
+
+if __name__ == "__main__":
+    index = get_ticker_index()
+    failures = 0
+    for query, expected in CASES:
+        entry = index.confident_company(query)
+        got = entry["ticker"] if entry else None
+        ok = got == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {query!r}: {got} (expected {expected})")
+    print(f"\n{len(CASES) - failures}/{len(CASES)} passed")
+    sys.exit(1 if failures else 0)
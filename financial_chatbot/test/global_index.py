@@ -0,0 +1,24 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.vector_store import LocalFAISS
+from core.global_index import GlobalIndex
+
+vector_store = LocalFAISS()
+global_index = GlobalIndex(vector_store)
+
+# Mirror every existing {ticker}_{year}_10k namespace into the sharded global index
+global_index.backfill()
+print(f"Namespaces in global index: {global_index.namespaces()}")
+
+# Cross-company question, restricted to risk factors
+query = "export controls on semiconductors"
+for chunk in global_index.search(query, top_k=10, sections=["1A"]):
+    meta = chunk["metadata"]
+    print(f"{meta['company_id']} {meta['filing_year']} item {meta['section']}: {chunk['text'][:120]!r}")
+
+# Per-namespace view over the global index
+view = global_index.view("AAPL_2024_10k")
+print(f"AAPL_2024_10k sections: {view.list_sections()}")
+print([c["metadata"]["chunk_id"] for c in view.search("supply chain", top_k=3)])
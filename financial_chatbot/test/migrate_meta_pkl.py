@@ -0,0 +1,39 @@
+import sys
+import os
+import faiss
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.chunk_store import ChunkStore, migrate_meta_pkl
+
+# Convert every legacy vector_db/{namespace}_meta.pkl into the columnar chunk store
+# ({namespace}.chunks/). The .pkl is renamed to .pkl.bak once the row count matches the index.
+
+def migrate_all_vector_db(vector_db_dir):
+    for file in sorted(os.listdir(vector_db_dir)):
+        if not file.endswith("_meta.pkl"):
+            continue
+
+        namespace = file[:-len("_meta.pkl")]
+        meta_path = os.path.join(vector_db_dir, file)
+        store_path = os.path.join(vector_db_dir, f"{namespace}.chunks")
+        index_path = os.path.join(vector_db_dir, f"{namespace}.index")
+
+        if ChunkStore(store_path).exists():
+            print(f"Skipping {namespace}: chunk store already exists")
+            continue
+
+        count = migrate_meta_pkl(meta_path, store_path)
+
+        if os.path.exists(index_path):
+            ntotal = faiss.read_index(index_path).ntotal
+            if ntotal != count:
+                print(f"⚠️ {namespace}: index has {ntotal} vectors but {count} chunks were migrated, keeping {file}")
+                continue
+
+        os.replace(meta_path, f"{meta_path}.bak")
+        print(f"✅ Migrated {namespace} ({count} chunks)")
+
+if __name__ == "__main__":
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    migrate_all_vector_db(sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_root, "vector_db"))
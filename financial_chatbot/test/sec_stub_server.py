@@ -0,0 +1,78 @@
+import sys
+import os
+import argparse
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.response_cache import ResponseCache, filing_key
+from config.settings import SEC_CACHE_DIR
+
+# Local stand-in for api.sec-api.io that replays a recorded response cache, so the pipeline
+# (HTTP client, retries, parsing) can be exercised without network access or an API key.
+#
+# Record once against the real API (fills sec_cache/), then replay:
+#   python test/sec_stub_server.py --cache-dir sec_cache --port 8003
+#   SEC_BASE_URL=http://127.0.0.1:8003 SEC_CACHE_DIR=/tmp/empty_cache python test/router_faiss.py
+# Requests that were never recorded get a 404.
+
+
+def make_handler(cache: ResponseCache):
+    class SecStubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") == "/extractor":
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                value = cache.get("extract", [filing_key(params.get("url", "")), params.get("item"), params.get("type", "text")])
+                self._send(value, "text/plain; charset=utf-8")
+            elif url.path.startswith("/mapping/name/"):
+                name = unquote(url.path[len("/mapping/name/"):])
+                self._send(cache.get("mapping_name", [name.strip().lower()]))
+            else:
+                self._send(None)
+
+        def do_POST(self):
+            # Full-text filing search: POST / with {"query": ..., "size": ...}
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            self._send(cache.get("filings", [payload.get("query"), payload.get("size")]))
+
+        def _send(self, value, content_type: str = "application/json"):
+            if value is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = value if isinstance(value, str) and content_type.startswith("text/") else json.dumps(value)
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logging.info(format % args)
+
+    return SecStubHandler
+
+
+def serve(cache_dir: str = SEC_CACHE_DIR, host: str = "127.0.0.1", port: int = 8003) -> ThreadingHTTPServer:
+    # Offline so recorded entries are served regardless of their age
+    server = ThreadingHTTPServer((host, port), make_handler(ResponseCache(cache_dir, offline=True)))
+    logging.info(f"SEC-API stub replaying {cache_dir} on http://{host}:{server.server_port}")
+    return server
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Replay recorded SEC-API responses")
+    parser.add_argument("--cache-dir", default=SEC_CACHE_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8003)
+    args = parser.parse_args()
+    serve(args.cache_dir, args.host, args.port).serve_forever()
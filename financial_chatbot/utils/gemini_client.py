@@ -1,16 +1,22 @@
 import google.generativeai as genai
-from config.settings import GEMINI_API_KEY, GEMINI_MODEL
+from config.settings import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_REQUESTS_PER_SECOND, GEMINI_BURST
+from utils.helpers import TokenBucket
 import time
 import logging
+import threading
 from langchain.llms.base import LLM
 from typing import Optional, List, Any
 
+# Gemini request quota, shared by every client in the process
+gemini_rate_limiter = TokenBucket(GEMINI_REQUESTS_PER_SECOND, GEMINI_BURST)
+
 class GeminiClient:
     def __init__(self,
                 temperature: float = 0.3,
                 top_p: float = 0.9,
                 top_k: int = 40,
-                max_output_tokens: int = 1024):
+                max_output_tokens: int = 1024,
+                rate_limiter: TokenBucket = gemini_rate_limiter):
         if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
@@ -23,10 +29,14 @@ class GeminiClient:
             "top_k": top_k,
             "max_output_tokens": max_output_tokens
         }
+        self.rate_limiter = rate_limiter
         
         
     def generate_response(self, prompt: str, max_retries: int = 3) -> str:
         for attempt in range(max_retries):
+            # Every attempt, retries included, takes a token, so 429 retries stay within the quota
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
             try:
                 response = self.model.generate_content(prompt)
                 return response.text
@@ -37,6 +47,19 @@ class GeminiClient:
                 else:
                     raise e
                 
+_gemini_client = None
+_gemini_client_lock = threading.Lock()
+
+
+def get_gemini_client() -> GeminiClient:
+    # One configured client per process for callers that do not need their own generation settings
+    global _gemini_client
+    with _gemini_client_lock:
+        if _gemini_client is None:
+            _gemini_client = GeminiClient()
+        return _gemini_client
+
+
 class GeminiLangChain(LLM):
     """LangChain-compatible wrapper around GeminiClient"""
 
@@ -0,0 +1,136 @@
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlparse
+from config.settings import MAX_RETRIES, RETRY_DELAY
+
+
+def retry_with_backoff(fn, max_retries: int = MAX_RETRIES, base_delay: float = RETRY_DELAY,
+                       should_retry=lambda e: True):
+    # Call fn(), retrying with exponential backoff and jitter while should_retry(error) holds
+    for attempt in range(max_retries):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == max_retries - 1 or not should_retry(e):
+                raise
+            time.sleep(_backoff_delay(attempt, base_delay, e))
+
+
+async def aretry_with_backoff(fn, max_retries: int = MAX_RETRIES, base_delay: float = RETRY_DELAY,
+                              should_retry=lambda e: True):
+    # Async retry_with_backoff: fn is a coroutine function, waits do not block the event loop
+    import asyncio
+    for attempt in range(max_retries):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == max_retries - 1 or not should_retry(e):
+                raise
+            await asyncio.sleep(_backoff_delay(attempt, base_delay, e))
+
+
+def _backoff_delay(attempt: int, base_delay: float, error: Exception) -> float:
+    delay = base_delay * (2 ** attempt) * (0.5 + random.random())
+    logging.warning(f"Attempt {attempt + 1} failed ({error}), retrying in {delay:.1f}s")
+    return delay
+
+
+class HostLimiter:
+    """Caps the number of in-flight requests per host across threads."""
+
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def limit(self, url: str):
+        with self._semaphore(url):
+            yield
+
+    @asynccontextmanager
+    async def alimit(self, url: str):
+        # Same per-host cap for coroutines, polled so that waiting never blocks the event loop
+        import asyncio
+        semaphore = self._semaphore(url)
+        while not semaphore.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            return self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        # Block until `tokens` are available
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0):
+        import asyncio
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def _take(self, tokens: float) -> float:
+        # Take tokens if available and return 0, otherwise return how long to wait
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+
+@contextmanager
+def file_lock(path: str):
+    # Exclusive advisory lock on `path` (created if missing), held across processes, e.g. uvicorn workers
+    # sharing a data directory. Without fcntl (Windows) it only serializes threads of this process.
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    with _thread_lock_for(path):
+        with open(path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+_thread_locks = {}
+_thread_locks_lock = threading.Lock()
+
+
+def _thread_lock_for(path: str) -> threading.Lock:
+    with _thread_locks_lock:
+        return _thread_locks.setdefault(os.path.abspath(path), threading.Lock())
@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+from config.settings import LLM_MAP_CONCURRENCY
+from utils.helpers import TokenBucket
+
+
+@dataclass
+class MapResult:
+    # One slot per input, in input order; None where the call failed
+    results: List[Any]
+    errors: Dict[int, Exception] = field(default_factory=dict)
+    latencies: List[float] = field(default_factory=list)
+
+    def successful(self) -> List[Any]:
+        return [r for r in self.results if r is not None]
+
+
+class ConcurrentMapper:
+    """Bounded-concurrency map for LLM calls: at most max_concurrency calls in flight process-wide,
+    each call optionally taking a token from a rate limiter. Failed items are reported, not raised."""
+
+    def __init__(self, max_concurrency: int = LLM_MAP_CONCURRENCY, rate_limiter: TokenBucket = None):
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-map")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def map(self, fn: Callable[[Any], Any], items: Sequence[Any]) -> MapResult:
+        futures = [self._pool.submit(self._call, fn, item) for item in items]
+
+        result = MapResult(results=[None] * len(futures), latencies=[0.0] * len(futures))
+        for i, future in enumerate(futures):
+            value, error, latency = future.result()
+            result.latencies[i] = latency
+            if error is None:
+                result.results[i] = value
+            else:
+                result.errors[i] = error
+
+        if result.errors:
+            logging.warning(f"Map step: {len(result.errors)}/{len(futures)} calls failed, continuing with the rest "
+                            f"(first error: {next(iter(result.errors.values()))})")
+        return result
+
+    def map_as_completed(self, fn: Callable[[Any], Any], items: Sequence[Any]) -> Iterator[Tuple[int, Any, Exception, float]]:
+        # (index, value, error, latency) per item as soon as its call finishes, for callers that merge incrementally
+        futures = {self._pool.submit(self._call, fn, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            value, error, latency = future.result()
+            yield futures[future], value, error, latency
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def _call(self, fn, item):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with self._lock:
+            self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            value, error = fn(item), None
+        except Exception as e:
+            value, error = None, e
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.in_flight -= 1
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+        return value, error, latency
+
+
+_llm_mapper = None
+_llm_mapper_lock = threading.Lock()
+
+
+def get_llm_mapper() -> ConcurrentMapper:
+    # One mapper per process, so the concurrency cap holds across requests and agents.
+    # The Gemini quota is enforced by GeminiClient itself, once per attempt (see utils/gemini_client.py).
+    global _llm_mapper
+    with _llm_mapper_lock:
+        if _llm_mapper is None:
+            _llm_mapper = ConcurrentMapper(LLM_MAP_CONCURRENCY)
+        return _llm_mapper
@@ -0,0 +1,74 @@
+import logging
+import re
+import subprocess
+import sys
+import threading
+from typing import Dict, Iterable, List
+from config.settings import SPACY_MODEL, SPACY_BATCH_SIZE, SPACY_N_PROCESS
+
+# Only NER and sentence boundaries are used; the statistical senter replaces the (much slower) parser.
+# In the en_core_web models ner and senter embed their own tok2vec, the shared one only feeds tagger/parser.
+SPACY_EXCLUDE = ["tok2vec", "lemmatizer", "attribute_ruler", "tagger", "parser"]
+MAX_DOC_CHARS = 1_000_000
+
+WHITESPACE_RE = re.compile(r"\s+")
+DISALLOWED_CHARS_RE = re.compile(r"[^\w\s\.\,\;\:\!\?\-\(\)]")
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    # Loaded on first use (not at import), downloading the model only if it is missing
+    global _nlp
+    with _nlp_lock:
+        if _nlp is None:
+            import spacy
+            try:
+                nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            except OSError:
+                logging.warning(f"spaCy model {SPACY_MODEL} not found, downloading it")
+                subprocess.run([sys.executable, "-m", "spacy", "download", SPACY_MODEL], check=True)
+                nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            if "senter" in nlp.disabled:
+                nlp.enable_pipe("senter")
+            logging.info(f"Loaded spaCy {SPACY_MODEL} with pipes {nlp.pipe_names}")
+            _nlp = nlp
+        return _nlp
+
+
+def clean_text(text: str) -> str:
+    text = WHITESPACE_RE.sub(" ", text)
+    text = DISALLOWED_CHARS_RE.sub(" ", text)
+    return text.strip()
+
+
+def extract_candidates(texts: Iterable[str], batch_size: int = SPACY_BATCH_SIZE,
+                       n_process: int = SPACY_N_PROCESS) -> List[List[Dict]]:
+    # Sentences naming at least two organizations, per input text, via one batched nlp.pipe pass:
+    # [{"text": sentence, "entities": [{"text", "start", "end"}]}] with ORG offsets into the sentence
+    nlp = get_nlp()
+    cleaned = (clean_text(text)[:MAX_DOC_CHARS] for text in texts)
+    candidates = []
+    for doc in nlp.pipe(cleaned, batch_size=batch_size, n_process=n_process):
+        doc_candidates = []
+        for sent in doc.sents:
+            orgs = [ent for ent in sent.ents if ent.label_ == "ORG"]
+            if len(orgs) < 2:
+                continue
+            text = sent.text.strip()
+            offset = sent.start_char + (len(sent.text) - len(sent.text.lstrip()))
+            doc_candidates.append({
+                "text": text,
+                "entities": [
+                    {"text": ent.text, "start": ent.start_char - offset, "end": ent.end_char - offset}
+                    for ent in orgs
+                ],
+            })
+        candidates.append(doc_candidates)
+    return candidates
+
+
+def extract_candidate_sentences(texts: Iterable[str], batch_size: int = SPACY_BATCH_SIZE,
+                                n_process: int = SPACY_N_PROCESS) -> List[List[str]]:
+    return [[c["text"] for c in doc_candidates] for doc_candidates in extract_candidates(texts, batch_size, n_process)]
@@ -1,7 +1,10 @@
 import logging
+import threading
 from typing import List
-from dataclasses import dataclass
-from utils.gemini_client import GeminiClient
+from dataclasses import dataclass, field
+from config.settings import RELATIONSHIP_BATCH_TOKENS, RELATIONSHIP_BATCH_CONCURRENCY
+from utils.gemini_client import get_gemini_client
+from utils.map_reduce import ConcurrentMapper
 import re
 
 @dataclass
@@ -13,6 +16,22 @@ class RelationshipSchema:
     context: str
 
 
+# Rough prompt-size estimate for batching (English filing text averages ~4 characters per token)
+CHARS_PER_TOKEN = 4
+
+_relationship_mapper = None
+_relationship_mapper_lock = threading.Lock()
+
+@dataclass
+class ExtractionStats:
+    # Filled in by one extract_relationships_gemini call (in_flight is live while it runs)
+    batches: int = 0
+    failed_batches: int = 0
+    in_flight: int = 0
+    batch_latency_ms: List[float] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+
 GENERIC_TERMS = {
     "subsidiaries", "customers", "partners", "shareholders", "employees", "stakeholders"
 }
@@ -31,22 +50,91 @@ def normalize_company_name(name: str) -> str:
 def is_generic_entity(name: str) -> bool:
     return name.lower().strip() in GENERIC_TERMS
 
-def extract_relationships_gemini(query, sentences: List[str], company_name: str) -> List[RelationshipSchema]:
+def extract_relationships_gemini(query, sentences: List[str], company_name: str,
+                                 stats: ExtractionStats = None) -> List[RelationshipSchema]:
     # Extract relationships from a list of sentences using Gemini function-calling style prompts.
-    gemini = GeminiClient()
-    relationships: List[RelationshipSchema] = []
-
+    # Batches are sized by a prompt token budget and sent concurrently; each response is merged
+    # into the deduplicated result as soon as it arrives. Pass stats to get this call's batch figures.
     if not sentences:
-        return relationships
+        return []
+
+    gemini = get_gemini_client()
+    mapper = get_relationship_mapper()
+    stats = stats if stats is not None else ExtractionStats()
+    batches = _token_batches(sentences, RELATIONSHIP_BATCH_TOKENS)
+    stats.batches = len(batches)
+    stats.batch_latency_ms = [0.0] * len(batches)
+    logging.info(f"Extracting relationships from {len(sentences)} sentences in {len(batches)} batches...")
+
+    company_lower = company_name.lower()
+
+    def entity_matches_company(entity: str) -> bool:
+        e = entity.lower()
+        return company_lower in e or e in company_lower
+
+    # (entity1, entity2, type) -> (batch index, relationship); the earliest batch wins, as in a sequential run
+    def extract_batch(batch):
+        with stats._lock:
+            stats.in_flight += 1
+        try:
+            return gemini.generate_response(_build_prompt(query, batch, company_name))
+        finally:
+            with stats._lock:
+                stats.in_flight -= 1
+
+    unique = {}
+    for i, response_text, error, latency in mapper.map_as_completed(extract_batch, batches):
+        stats.batch_latency_ms[i] = round(latency * 1000, 1)
+        if error is not None:
+            stats.failed_batches += 1
+            print(f"Error extracting relationships with Gemini: {error}")
+            continue
+        for r in _parse_relationships(response_text):
+            if not (entity_matches_company(r.entity1) or entity_matches_company(r.entity2)):
+                continue
+            key = (r.entity1.lower().strip(), r.entity2.lower().strip(), r.relationship_type.lower().strip())
+            if key not in unique or unique[key][0] > i:
+                unique[key] = (i, r)
 
-    logging.info(f"Extracting relationships from {len(sentences)} sentences...")
+    relationships = [r for _, r in sorted(unique.values(), key=lambda entry: entry[0])]
+    logging.info(f"Relationship batches: {stats} (mapper: {mapper.stats()})")
+
+    print(f"Extracted {len(relationships)} relationships.")
+    print(f'eg relationships extracted: {relationships[:5]}')
+    return relationships
+
+
+def extraction_stats() -> dict:
+    # Process-wide live in-flight/completed/failed counts of the batch mapper (per-call figures: ExtractionStats)
+    return get_relationship_mapper().stats()
+
+
+def get_relationship_mapper() -> ConcurrentMapper:
+    # Its own concurrency cap; the Gemini quota is shared through GeminiClient's rate limiter
+    global _relationship_mapper
+    with _relationship_mapper_lock:
+        if _relationship_mapper is None:
+            _relationship_mapper = ConcurrentMapper(RELATIONSHIP_BATCH_CONCURRENCY)
+        return _relationship_mapper
+
+
+def _token_batches(sentences: List[str], max_tokens: int) -> List[List[str]]:
+    # Consecutive sentences packed up to max_tokens (estimated); a longer sentence gets a batch of its own
+    batches, batch, batch_tokens = [], [], 0
+    for sentence in sentences:
+        n_tokens = len(sentence) // CHARS_PER_TOKEN + 1
+        if batch and batch_tokens + n_tokens > max_tokens:
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(sentence)
+        batch_tokens += n_tokens
+    if batch:
+        batches.append(batch)
+    return batches
 
-    # Process in batches to avoid overly long prompts
-    batch_size = 10
-    for i in range(0, len(sentences), batch_size):
-        batch = sentences[i:i + batch_size]
 
-        prompt = f"""
+def _build_prompt(query, batch: List[str], company_name: str) -> str:
+    return f"""
             User Query: {query}
 
             You are an expert at extracting **real** business relationships from SEC 10-K filings.
@@ -88,61 +176,32 @@ def extract_relationships_gemini(query, sentences: List[str], company_name: str)
             {chr(10).join(batch)}
             """
 
+
+def _parse_relationships(response_text: str) -> List[RelationshipSchema]:
+    relationships = []
+    for rel in _safe_parse_json(response_text) or []:
         try:
-            response_text = gemini.generate_response(prompt)
-            extracted = _safe_parse_json(response_text)
-
-            if extracted:
-                for rel in extracted:
-                    try:
-                        e1 = normalize_company_name(rel.get("entity1", ""))
-                        e2 = normalize_company_name(rel.get("entity2", ""))
-
-                        # Skip generic placeholder entities
-                        if not e1 or not e2 or is_generic_entity(e1) or is_generic_entity(e2):
-                            continue
-
-                        relationships.append(
-                            RelationshipSchema(
-                                entity1=e1,
-                                entity2=e2,
-                                relationship_type=rel.get("relationship_type", "other"),
-                                confidence=float(rel.get("confidence", 0.5)),
-                                context=rel.get("context", "").strip()
-                            )
-                        )
-                    except Exception as parse_error:
-                        print(f"Error parsing relationship object: {parse_error}")
-                        continue
-
-        except Exception as e:
-            print(f"Error extracting relationships with Gemini: {e}")
+            e1 = normalize_company_name(rel.get("entity1", ""))
+            e2 = normalize_company_name(rel.get("entity2", ""))
+
+            # Skip generic placeholder entities
+            if not e1 or not e2 or is_generic_entity(e1) or is_generic_entity(e2):
+                continue
+
+            relationships.append(
+                RelationshipSchema(
+                    entity1=e1,
+                    entity2=e2,
+                    relationship_type=rel.get("relationship_type", "other"),
+                    confidence=float(rel.get("confidence", 0.5)),
+                    context=rel.get("context", "").strip()
+                )
+            )
+        except Exception as parse_error:
+            print(f"Error parsing relationship object: {parse_error}")
             continue
-    
-    def entity_matches_company(entity: str) -> bool:
-        e = entity.lower()
-        return company_lower in e or e in company_lower
-    
-    print (f'relationships before filtering:{relationships}')
-    company_lower = company_name.lower()
-    relationships= [r for r in relationships if entity_matches_company(r.entity1) or entity_matches_company(r.entity2)]
+    return relationships
 
-    unique = {}
-    for r in relationships:
-        key = (
-            r.entity1.lower().strip(),
-            r.entity2.lower().strip(),
-            r.relationship_type.lower().strip()
-        )
-        # Keep the first occurrence only
-        if key not in unique:
-            unique[key] = r
-
-    relationships = list(unique.values())
-
-    print(f"Extracted {len(relationships)} relationships.")
-    print(f'eg relationships extracted: {relationships[:5]}')
-    return relationships 
 
 def _safe_parse_json(text: str):
     import json
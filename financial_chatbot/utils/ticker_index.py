@@ -0,0 +1,245 @@
+import difflib
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+TICKERS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "company_tickers.json")
+
+# Corporate suffixes and filler words that do not identify a company
+STOP_WORDS = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "companies", "ltd", "limited",
+    "plc", "llc", "lp", "sa", "nv", "ag", "se", "the", "and", "of", "de", "del",
+}
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Gazetteer matching over the original query: words with their case, and ticker-like
+# symbols. A ".X"/"-X" share-class suffix ("BRK.B") is kept only on short all-caps tokens; other words split
+# on "-" and "." like normalize_name does ("Coca-Cola", "T-Mobile")
+WORD_RE = re.compile(r"\$?[A-Z]{1,5}[.\-][A-Z]\b|\$?[A-Za-z0-9]+")
+TICKER_RE = re.compile(r"\$?[A-Z]{1,5}(?:[.\-][A-Z])?")
+# Trailing words dropped to form a shorter alias ("Amazon.com" -> "amazon", "Meta Platforms" -> "meta")
+ALIAS_SUFFIXES = {"com", "holdings", "holding", "group", "platforms", "motor", "technologies", "international", "us"}
+# Upper-case words in questions that are also listed tickers
+NON_TICKER_WORDS = {
+    "A", "I", "AI", "AM", "AN", "ARE", "AS", "AT", "BE", "BY", "CEO", "CFO", "DO", "EPS", "ESG", "FOR", "GDP",
+    "HAS", "IF", "IN", "IPO", "IS", "IT", "ITS", "K", "ME", "MD", "NEW", "NOW", "OF", "ON", "OR", "OUT", "Q",
+    "R", "SEC", "SO", "THE", "TO", "UK", "UP", "US", "USA", "WHO", "YOY",
+    # Finance, accounting and business acronyms
+    "API", "APAC", "ARR", "B", "CAC", "COO", "CTO", "DEI", "EU", "FCF", "HR", "IOT", "IP", "IR", "IRS", "LTM",
+    "M", "NI", "NIM", "OI", "PC", "PEG", "PR", "SGA", "TV",
+    "AGM", "CASH", "CET", "CIO", "CSR", "GHG", "SBC",
+}
+# Bare tickers this short collide with acronyms ("IP", "EU") and need a $ prefix or a name mention
+MIN_BARE_TICKER_LETTERS = 3
+# Capitalized question words that must never match a one-word company name
+QUERY_WORDS = {
+    "what", "how", "why", "who", "which", "when", "where", "tell", "show", "give", "list", "is", "are",
+    "does", "do", "can", "compare", "summarize", "explain", "describe", "analyze", "please",
+}
+
+
+def normalize_name(name: str) -> str:
+    # "Apple Inc." -> "apple", "The Coca-Cola Company" -> "coca cola"
+    tokens = TOKEN_RE.findall(name.lower().replace("&", " and "))
+    kept = [t for t in tokens if t not in STOP_WORDS]
+    return " ".join(kept or tokens)
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TickerIndex:
+    """In-memory lookup structures over SEC company_tickers.json, built once per process.
+
+    Entries keep file order (roughly by market cap), which is used as the tie-breaker,
+    so "apple" resolves to Apple Inc. rather than a smaller namesake.
+    """
+
+    def __init__(self, ticker_data: Dict[str, Dict]):
+        self.entries: List[Dict] = []
+        self.by_ticker: Dict[str, int] = {}
+        self.by_name: Dict[str, int] = {}
+        self.tokens: Dict[str, List[int]] = {}
+        self.trigrams: Dict[str, List[int]] = {}
+        self.names: List[str] = []
+
+        for raw in ticker_data.values():
+            ticker = raw.get("ticker")
+            title = raw.get("title", "")
+            if not ticker:
+                continue
+            i = len(self.entries)
+            name = normalize_name(title)
+            self.entries.append({"ticker": ticker.upper(), "cik": str(raw.get("cik_str")).lstrip("0"), "title": title})
+            self.names.append(name)
+            self.by_ticker.setdefault(ticker.upper(), i)
+            self.by_name.setdefault(name, i)
+            for token in set(name.split()):
+                self.tokens.setdefault(token, []).append(i)
+            for gram in trigrams(name):
+                self.trigrams.setdefault(gram, []).append(i)
+
+        self._trie = None
+        self._trie_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = TICKERS_PATH) -> "TickerIndex":
+        try:
+            with open(path, "r") as f:
+                return cls(json.load(f))
+        except Exception as e:
+            logging.error(f"Could not load SEC ticker JSON: {e}")
+            return cls({})
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup_ticker(self, ticker: str) -> Optional[Dict]:
+        i = self.by_ticker.get(ticker.upper().strip())
+        return self.entries[i] if i is not None else None
+
+    def match_name(self, company_name: str) -> Optional[Dict]:
+        # Exact name, then names containing the query as a phrase, then best token overlap, then fuzzy
+        name = normalize_name(company_name)
+        if not name:
+            return None
+
+        i = self.by_name.get(name)
+        if i is not None:
+            return self.entries[i]
+
+        query_tokens = set(name.split())
+        postings = [self.tokens.get(t, []) for t in query_tokens]
+        if all(postings):
+            candidates = set(postings[0]).intersection(*postings[1:])
+            phrase = f" {name} "
+            contained = [i for i in candidates if phrase in f" {self.names[i]} "]
+            if contained:
+                return self.entries[min(contained)]
+
+        overlap = Counter(i for posting in postings for i in posting)
+        if overlap:
+            best = max(overlap.values())
+            return self.entries[min(i for i, count in overlap.items() if count == best)]
+
+        return self.fuzzy(company_name)
+
+    def fuzzy(self, company_name: str, cutoff: float = 0.8, max_candidates: int = 20) -> Optional[Dict]:
+        # Shortlist by shared trigrams, then confirm with difflib on the shortlist only
+        name = normalize_name(company_name)
+        query_grams = trigrams(name)
+        shared = Counter(i for gram in query_grams for i in self.trigrams.get(gram, ()))
+        if not shared:
+            return None
+
+        def dice(i):
+            return 2 * shared[i] / (len(query_grams) + len(self.names[i]) + 2)
+
+        shortlist = sorted(shared, key=lambda i: (-dice(i), i))[:max_candidates]
+        best_i, best_ratio = None, cutoff
+        for i in shortlist:
+            ratio = difflib.SequenceMatcher(None, name, self.names[i]).ratio()
+            if ratio > best_ratio or (ratio == best_ratio and best_i is None):
+                best_i, best_ratio = i, ratio
+        return self.entries[best_i] if best_i is not None else None
+
+    def find_mentions(self, text: str) -> List[Dict]:
+        # Companies mentioned in free text, via ticker symbols and a token-level trie of names
+        # (Aho-Corasick style longest match at every position). Each mention is
+        # {"entry", "kind": "ticker"|"name", "start", "end"} with word positions; ticker mentions
+        # also carry "prefixed" (written as $TICKER).
+        words = WORD_RE.findall(text)
+        mentions = []
+
+        for pos, word in enumerate(words):
+            if TICKER_RE.fullmatch(word) and (word.startswith("$") or (len(word) > 1 and word not in NON_TICKER_WORDS)):
+                # Share classes are listed as "BRK-B" but often written "BRK.B"
+                i = self.by_ticker.get(word.lstrip("$").replace(".", "-"))
+                if i is not None:
+                    mentions.append({"entry": self.entries[i], "kind": "ticker", "start": pos, "end": pos + 1,
+                                     "prefixed": word.startswith("$")})
+
+        tokens = [w.lstrip("$").lower() for w in words]
+        trie = self._gazetteer()
+        pos = 0
+        while pos < len(tokens):
+            node, match = trie, None
+            for end in range(pos, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if "$" in node:
+                    match = (node["$"], end + 1)
+            if match and self._confident_name(words[pos:match[1]]):
+                mentions.append({"entry": self.entries[match[0]], "kind": "name", "start": pos, "end": match[1]})
+                pos = match[1]
+            else:
+                pos += 1
+        return mentions
+
+    def confident_company(self, text: str) -> Optional[Dict]:
+        # The one company a query is clearly about, or None. Names, $TICKERs and bare 3-5 letter tickers
+        # ("AAPL risks") count; a bare 1-2 letter ticker ("IP litigation", "exposure to the EU") is not
+        # enough on its own and needs a $ prefix or a name mention of the same company.
+        mentions = self.find_mentions(text)
+        if len({m["entry"]["ticker"] for m in mentions}) != 1:
+            return None
+        if not any(m["kind"] == "name" or m["prefixed"] or self._confident_ticker(m["entry"]["ticker"])
+                   for m in mentions):
+            return None
+        return mentions[0]["entry"]
+
+    def _confident_ticker(self, ticker: str) -> bool:
+        # Share-class suffixes do not count towards the length: "BRK-B" is a 3-letter ticker
+        return len(re.split(r"[.\-]", ticker)[0]) >= MIN_BARE_TICKER_LETTERS
+
+    def _confident_name(self, words: List[str]) -> bool:
+        # Multi-word names match in any case; one-word names ("Apple", "Target") only as capitalized proper nouns,
+        # and never as an acronym ("API" is not APi Group)
+        if len(words) > 1:
+            return True
+        word = words[0]
+        return word[:1].isupper() and word.lower() not in QUERY_WORDS and word.lstrip("$") not in NON_TICKER_WORDS
+
+    def _gazetteer(self) -> Dict:
+        with self._trie_lock:
+            if self._trie is None:
+                trie = {}
+                aliases = []
+                for i, name in enumerate(self.names):
+                    self._trie_insert(trie, name.split(), i)
+                    tokens = name.split()
+                    while len(tokens) > 1 and tokens[-1] in ALIAS_SUFFIXES:
+                        tokens = tokens[:-1]
+                        aliases.append((tokens, i))
+                # Aliases never shadow a real name
+                for tokens, i in aliases:
+                    self._trie_insert(trie, tokens, i)
+                self._trie = trie
+            return self._trie
+
+    @staticmethod
+    def _trie_insert(trie: Dict, tokens: List[str], i: int):
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault("$", i)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ticker_index() -> TickerIndex:
+    # One index per process, shared by MappingApi and EntityExtractor
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TickerIndex.load()
+        return _index